@@ -6,22 +6,11 @@ Validates that UAT detection works correctly with various phrases
 
 import sys
 import os
-import importlib.util
 
 sys.path.append(os.path.dirname(__file__))
 
-# Import with proper module name handling
-try:
-    from uat_session_manager import UATSessionManager
-except ImportError:
-    # Handle hyphenated module name
-    spec = importlib.util.spec_from_file_location(
-        "uat_session_manager", 
-        os.path.join(os.path.dirname(__file__), "uat-session-manager.py")
-    )
-    uat_session_manager = importlib.util.module_from_spec(spec)
-    spec.loader.exec_module(uat_session_manager)
-    UATSessionManager = uat_session_manager.UATSessionManager
+# Import session manager
+from uat_session_manager import UATSessionManager
 
 def test_uat_detection():
     """Test UAT detection with various phrases"""
@@ -57,17 +46,17 @@ def test_uat_detection():
         ("Test the UAT login-flow scenario", True, "login-flow"),  # Direct scenario name
     ]
     
-    print("UAT Detection Test Results")
-    print("=" * 70)
-    print(f"{'Test Phrase':<45} {'Expected':<10} {'Actual':<10} {'Status'}")
-    print("-" * 70)
+    # Run every detection first, then format the whole table in one pass
+    results = [
+        (phrase, expected_is_uat, expected_scenario, *manager.detect_uat_intent(phrase))
+        for phrase, expected_is_uat, expected_scenario in test_cases
+    ]
     
+    rows = []
     passed = 0
     failed = 0
     
-    for phrase, expected_is_uat, expected_scenario in test_cases:
-        is_uat, scenario = manager.detect_uat_intent(phrase)
-        
+    for phrase, expected_is_uat, expected_scenario, is_uat, scenario in results:
         # Check if detection matches expectation
         if is_uat == expected_is_uat and scenario == expected_scenario:
             status = "✓ PASS"
@@ -77,15 +66,17 @@ def test_uat_detection():
             failed += 1
             
         # Format output
-        expected = f"{expected_is_uat}"
-        if expected_scenario:
-            expected += f" ({expected_scenario})"
-            
-        actual = f"{is_uat}"
-        if scenario:
-            actual += f" ({scenario})"
-            
-        print(f"{phrase:<45} {expected:<10} {actual:<10} {status}")
+        expected = f"{expected_is_uat} ({expected_scenario})" if expected_scenario else f"{expected_is_uat}"
+        actual = f"{is_uat} ({scenario})" if scenario else f"{is_uat}"
+        rows.append(f"{phrase:<45} {expected:<10} {actual:<10} {status}")
+    
+    sys.stdout.write("\n".join([
+        "UAT Detection Test Results",
+        "=" * 70,
+        f"{'Test Phrase':<45} {'Expected':<10} {'Actual':<10} {'Status'}",
+        "-" * 70,
+        *rows,
+    ]) + "\n")
     
     print("-" * 70)
     print(f"Results: {passed} passed, {failed} failed")
@@ -7,52 +7,44 @@ Marks steps as completed when MCP tools execute successfully
 import json
 import sys
 import os
-import importlib.util
 
 # Import session manager
-try:
-    from uat_session_manager import UATSessionManager
-except ImportError:
-    spec = importlib.util.spec_from_file_location(
-        "uat_session_manager", 
-        os.path.join(os.path.dirname(__file__), "uat-session-manager.py")
-    )
-    uat_session_manager = importlib.util.module_from_spec(spec)
-    spec.loader.exec_module(uat_session_manager)
-    UATSessionManager = uat_session_manager.UATSessionManager
+from uat_session_manager import UATSessionManager
+
+# Tool name prefixes of the browser MCP servers UAT drives
+_MCP_PREFIXES = ('mcp__playwright__', 'mcp__browsermcp__')
 
 class UATCompletionTracker:
     def __init__(self):
         self.manager = UATSessionManager()
         self.uat_root = '/mnt/c/projects/vrp-system/v4/uat'
         
+        # Completed step numbers as a set, seeded from the session on first use
+        self._completed_steps = None
+        
     def is_mcp_tool_execution(self, tool_name):
         """Check if this is an MCP tool that should be tracked"""
-        mcp_patterns = [
-            'mcp__playwright__',
-            'mcp__browsermcp__'
-        ]
-        
-        if not tool_name:
-            return False
-            
-        for pattern in mcp_patterns:
-            if tool_name.startswith(pattern):
-                return True
-                
-        return False
+        return bool(tool_name) and tool_name.startswith(_MCP_PREFIXES)
     
     def load_execution_plan(self, session_id):
         """Load execution plan for current session"""
         try:
-            session_dir = os.path.join(self.uat_root, 'sessions', session_id)
-            plan_file = os.path.join(session_dir, 'execution-plan.json')
+            plan_file = os.path.join(self.manager.session_dir, session_id, 'execution-plan.json')
             
-            if not os.path.exists(plan_file):
+            try:
+                with open(plan_file, 'r') as f:
+                    execution_plan = json.load(f)
+            except FileNotFoundError:
+                # No plan saved for this session yet
                 return None
                 
-            with open(plan_file, 'r') as f:
-                return json.load(f)
+            # Index tool -> first matching step once instead of scanning per lookup
+            step_by_tool = {}
+            for action in execution_plan.get('sequence', []):
+                step_by_tool.setdefault(action['tool'], action['step'])
+            execution_plan['_step_by_tool'] = step_by_tool
+            
+            return execution_plan
         except Exception as e:
             sys.stderr.write(f"UAT Completion Tracker: Failed to load execution plan: {str(e)}\n")
             return None
@@ -63,34 +55,28 @@ class UATCompletionTracker:
             if not execution_plan or not execution_plan.get('sequence'):
                 return None
                 
-            # Find matching step based on tool name and parameters
-            for action in execution_plan['sequence']:
-                if action['tool'] == tool_name:
-                    # For now, match by tool name
-                    # Could enhance to match parameters for more precision
-                    return action['step']
-                    
-            return None
+            # For now, match by tool name
+            # Could enhance to match parameters for more precision
+            return execution_plan['_step_by_tool'].get(tool_name)
             
         except Exception as e:
             sys.stderr.write(f"UAT Completion Tracker: Error finding step: {str(e)}\n")
             return None
     
-    def update_execution_progress(self, session_id, step_number, tool_name):
-        """Update execution progress to mark step as completed"""
+    def update_execution_progress(self, session, step_number, tool_name):
+        """Mark step as completed on the loaded session and persist it once"""
         try:
-            session = self.manager.load_session()
-            if not session:
-                return False
-                
             # Get current execution progress
-            progress = session.get('execution_progress', {})
+            progress = session.setdefault('execution_progress', {})
+            
+            completed_steps = progress.setdefault('completed_steps', [])
+            if self._completed_steps is None:
+                self._completed_steps = set(completed_steps)
             
-            # Mark step as completed
-            if step_number and step_number not in progress.get('completed_steps', []):
-                if 'completed_steps' not in progress:
-                    progress['completed_steps'] = []
-                progress['completed_steps'].append(step_number)
+            # Mark step as completed; the persisted list keeps completion order
+            if step_number and step_number not in self._completed_steps:
+                self._completed_steps.add(step_number)
+                completed_steps.append(step_number)
                 progress['last_executed_tool'] = tool_name
                 progress['status'] = 'executing'
                 
@@ -99,14 +85,15 @@ class UATCompletionTracker:
                     progress['current_step'] = step_number + 1
                 
                 # Save updated session
-                self.manager.update_session({'execution_progress': progress})
+                self.manager.save_session(session)
                 
                 sys.stderr.write(f"UAT Completion Tracker: Marked step {step_number} as completed ({tool_name})\n")
-                return True
+                
+            return progress
                 
         except Exception as e:
             sys.stderr.write(f"UAT Completion Tracker: Failed to update progress: {str(e)}\n")
-            return False
+            return None
     
     def get_completion_percentage(self, session):
         """Calculate completion percentage"""
@@ -116,7 +103,8 @@ class UATCompletionTracker:
             total = progress.get('total_steps', 0)
             
             if total > 0:
-                return round((completed / total) * 100, 1)
+                # Tenths of a percent in integer math, rounded half up
+                return (completed * 1000 + total // 2) // total / 10
             return 0.0
             
         except Exception:
@@ -126,7 +114,7 @@ class UATCompletionTracker:
         """Main PostToolUse hook processing logic"""
         try:
             # Read input from stdin
-            input_data = json.loads(sys.stdin.read())
+            input_data = json.loads(sys.stdin.buffer.read())
             
             tool_name = input_data.get('tool_name', '')
             tool_input = input_data.get('tool_input', {})
@@ -155,16 +143,12 @@ class UATCompletionTracker:
                 sys.stderr.write(f"UAT Completion Tracker: Could not find step for tool {tool_name}\n")
                 sys.exit(0)
             
-            # Update execution progress
-            self.update_execution_progress(session['sessionId'], step_number, tool_name)
-            
-            # Get updated progress for reporting
-            updated_session = self.manager.load_session()
-            if updated_session:
-                progress = updated_session.get('execution_progress', {})
+            # Update execution progress on the session loaded above
+            progress = self.update_execution_progress(session, step_number, tool_name)
+            if progress is not None:
                 completed_steps = len(progress.get('completed_steps', []))
                 total_steps = execution_plan['total_actions']
-                completion_pct = self.get_completion_percentage(updated_session)
+                completion_pct = self.get_completion_percentage(session)
                 
                 # Provide progress feedback
                 print(f"\n✅ **UAT Step Completed**: {step_number}/{total_steps} ({completion_pct}%)")
@@ -172,10 +156,9 @@ class UATCompletionTracker:
                 # Check if this was the final step
                 if completed_steps >= total_steps:
                     print("🎉 **ALL UAT STEPS COMPLETED!** 100% scenario coverage achieved!")
-                    self.manager.update_session({
-                        'execution_progress': {**progress, 'status': 'completed'},
-                        'phase': 'completed'
-                    })
+                    progress['status'] = 'completed'
+                    session['phase'] = 'completed'
+                    self.manager.save_session(session)
                 else:
                     remaining = total_steps - completed_steps
                     print(f"📋 **Next**: Execute step {step_number + 1}/{total_steps} ({remaining} steps remaining)")
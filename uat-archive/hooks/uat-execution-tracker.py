@@ -7,21 +7,58 @@ Tracks UAT execution progress and guides Claude through the next step only
 import json
 import sys
 import os
-import importlib.util
 
 # Import session manager
-try:
-    from uat_session_manager import UATSessionManager
-except ImportError:
-    spec = importlib.util.spec_from_file_location(
-        "uat_session_manager", 
-        os.path.join(os.path.dirname(__file__), "uat-session-manager.py")
-    )
-    uat_session_manager = importlib.util.module_from_spec(spec)
-    spec.loader.exec_module(uat_session_manager)
-    UATSessionManager = uat_session_manager.UATSessionManager
+from uat_session_manager import UATSessionManager
+
+# Tool name prefixes of the browser MCP servers UAT drives
+_MCP_PREFIXES = ('mcp__playwright__', 'mcp__browsermcp__')
+
+# Parameter value formatters by JSON value type, anything else falls back to repr
+_FMT = {
+    str: lambda value: f'"{value}"',
+    bool: lambda value: str(value).lower(),
+    int: str,
+    float: str,
+    dict: json.dumps
+}
+
+# Banner templates rendered with str.format_map
+_COMPLETE_BANNER = "\n".join([
+    "\n" + "🎉 " + "="*50,
+    "UAT EXECUTION COMPLETE!",
+    "="*52,
+    "✅ All {total_actions} steps executed successfully",
+    "📊 Session: {session_id}",
+    "🏆 100% scenario coverage achieved!",
+    "="*52 + "\n"
+]) + "\n"
+
+_GUIDANCE_BANNER = "\n".join([
+    "\n" + "⚠️ " + "="*50,
+    "UAT EXECUTION SEQUENCE GUIDANCE",
+    "="*52,
+    "📍 Current Progress: {completed_steps}/{total_steps} steps completed",
+    "🎯 Next Required Step: {step_number}/{total_steps} ({progress_percentage}%)",
+    "",
+    "**Expected Tool**: {tool}",
+    "**Attempted Tool**: {attempted_tool}",
+    "",
+    "🔸 **EXECUTE THIS EXACT FUNCTION CALL NEXT:**",
+    "```",
+    "{function_call}",
+    "```",
+    "",
+    "*Description*: {description}",
+    "",
+    "⚡ **Please execute the expected tool above before proceeding**",
+    "="*52 + "\n"
+]) + "\n"
 
 class UATExecutionTracker:
+    # Parsed execution plans keyed by path, invalidated on (mtime_ns, size) change
+    _plan_cache = {}
+    
     def __init__(self):
         self.manager = UATSessionManager()
         self.uat_root = '/mnt/c/projects/vrp-system/v4/uat'
@@ -29,14 +66,31 @@ class UATExecutionTracker:
     def load_execution_plan(self, session_id):
         """Load execution plan for current session"""
         try:
-            session_dir = os.path.join(self.uat_root, 'sessions', session_id)
-            plan_file = os.path.join(session_dir, 'execution-plan.json')
+            plan_file = os.path.join(self.manager.session_dir, session_id, 'execution-plan.json')
             
-            if not os.path.exists(plan_file):
+            try:
+                stat = os.stat(plan_file)
+            except FileNotFoundError:
                 return None
                 
+            # Reuse the parsed plan while the file on disk is unchanged
+            stamp = (stat.st_mtime_ns, stat.st_size)
+            cached = self._plan_cache.get(plan_file)
+            if cached and cached[0] == stamp:
+                return cached[1]
+                
             with open(plan_file, 'r') as f:
-                return json.load(f)
+                execution_plan = json.load(f)
+                
+            # Index step -> first matching action and render each call once per plan
+            by_step = {}
+            for action in execution_plan.get('sequence', []):
+                action['_call'] = self.generate_function_call_syntax(action.get('tool'), action.get('params'))
+                by_step.setdefault(action['step'], action)
+            execution_plan['_by_step'] = by_step
+            
+            self._plan_cache[plan_file] = (stamp, execution_plan)
+            return execution_plan
         except Exception as e:
             sys.stderr.write(f"UAT Tracker: Failed to load execution plan: {str(e)}\n")
             return None
@@ -56,15 +110,15 @@ class UATExecutionTracker:
             'status': progress.get('status', 'ready')
         }
     
-    def update_execution_progress(self, session_id, step_number, tool_name, status='completed'):
-        """Update execution progress in session"""
+    def update_execution_progress(self, session, step_number, tool_name, status='completed'):
+        """Update execution progress in the already-loaded session"""
         try:
-            session = self.manager.load_session()
             if not session:
                 return False
                 
             # Initialize execution progress if not exists
-            if 'execution_progress' not in session:
+            created = 'execution_progress' not in session
+            if created:
                 session['execution_progress'] = {
                     'current_step': 1,
                     'completed_steps': [],
@@ -74,6 +128,7 @@ class UATExecutionTracker:
                 }
             
             progress = session['execution_progress']
+            before = {**progress, 'completed_steps': list(progress['completed_steps'])}
             
             if status == 'completed':
                 # Mark step as completed
@@ -85,8 +140,9 @@ class UATExecutionTracker:
                 progress['last_executed_tool'] = tool_name
                 progress['status'] = 'executing'
                 
-            # Save updated session
-            self.manager.update_session({'execution_progress': progress})
+            # Rewrite the session only when progress actually changed
+            if created or progress != before:
+                self.manager.save_session(session)
             return True
             
         except Exception as e:
@@ -100,12 +156,7 @@ class UATExecutionTracker:
                 return None
                 
             # Find the next step to execute
-            next_action = None
-            for action in execution_plan['sequence']:
-                if action['step'] == current_step:
-                    next_action = action
-                    break
-                    
+            next_action = execution_plan['_by_step'].get(current_step)
             if not next_action:
                 return None
                 
@@ -116,15 +167,12 @@ class UATExecutionTracker:
             description = next_action['description']
             params = next_action['params']
             
-            # Generate exact function call
-            function_call = self.generate_function_call_syntax(tool, params)
-            
             guidance = {
                 'step_number': step_num,
                 'total_steps': total_steps,
                 'tool': tool,
                 'description': description,
-                'function_call': function_call,
+                'function_call': next_action['_call'],
                 'params': params,
                 'progress_percentage': round((step_num / total_steps) * 100, 1)
             }
@@ -142,20 +190,9 @@ class UATExecutionTracker:
                 return f"# Invalid tool call: {tool}"
             
             # Build parameter string
-            param_parts = []
-            for key, value in params.items():
-                if isinstance(value, str):
-                    param_parts.append(f'{key}="{value}"')
-                elif isinstance(value, bool):
-                    param_parts.append(f'{key}={str(value).lower()}')
-                elif isinstance(value, (int, float)):
-                    param_parts.append(f'{key}={value}')
-                elif isinstance(value, dict):
-                    param_parts.append(f'{key}={json.dumps(value)}')
-                else:
-                    param_parts.append(f'{key}={repr(value)}')
-            
-            param_string = ', '.join(param_parts)
+            param_string = ', '.join(
+                f'{key}={_FMT.get(type(value), repr)(value)}' for key, value in params.items()
+            )
             return f"{tool}({param_string})"
             
         except Exception as e:
@@ -163,19 +200,7 @@ class UATExecutionTracker:
     
     def is_mcp_tool_execution(self, tool_name):
         """Check if this is an MCP tool that should be tracked"""
-        mcp_patterns = [
-            'mcp__playwright__',
-            'mcp__browsermcp__'
-        ]
-        
-        if not tool_name:
-            return False
-            
-        for pattern in mcp_patterns:
-            if tool_name.startswith(pattern):
-                return True
-                
-        return False
+        return bool(tool_name) and tool_name.startswith(_MCP_PREFIXES)
     
     def should_provide_guidance(self, tool_input):
         """Determine if we should provide execution guidance"""
@@ -184,11 +209,13 @@ class UATExecutionTracker:
         # Only provide guidance for MCP tool execution
         return self.is_mcp_tool_execution(tool_name)
     
-    def process_hook(self):
+    def process_hook(self, raw_input=None):
         """Main PreToolUse hook processing logic"""
         try:
-            # Read input from stdin
-            input_data = json.loads(sys.stdin.read())
+            # Read input from stdin unless the caller already did
+            if raw_input is None:
+                raw_input = sys.stdin.buffer.read()
+            input_data = json.loads(raw_input)
             
             tool_name = input_data.get('tool_name', '')
             tool_input = input_data.get('tool_input', {})
@@ -205,10 +232,12 @@ class UATExecutionTracker:
                 sys.exit(0)
             
             # Check if session has an execution plan
-            execution_plan = self.load_execution_plan(session['sessionId'])
+            session_id = session['sessionId']
+            execution_plan = self.load_execution_plan(session_id)
             if not execution_plan:
                 # No execution plan, exit normally
                 sys.exit(0)
+            total_actions = execution_plan['total_actions']
                 
             # Get current progress
             progress = self.get_execution_progress(session)
@@ -217,26 +246,24 @@ class UATExecutionTracker:
                 progress = {
                     'current_step': 1,
                     'completed_steps': [],
-                    'total_steps': execution_plan['total_actions'],
+                    'total_steps': total_actions,
                     'last_executed_tool': '',
                     'status': 'ready'
                 }
-                self.update_execution_progress(session['sessionId'], 0, '', 'in_progress')
+                self.update_execution_progress(session, 0, '', 'in_progress')
             
             # Check if all steps are completed
-            if progress['current_step'] > execution_plan['total_actions']:
-                print("\n" + "🎉 " + "="*50)
-                print("UAT EXECUTION COMPLETE!")
-                print("="*52)
-                print(f"✅ All {execution_plan['total_actions']} steps executed successfully")
-                print(f"📊 Session: {session['sessionId']}")
-                print(f"🏆 100% scenario coverage achieved!")
-                print("="*52 + "\n")
-                sys.stderr.write(f"UAT Tracker: All steps completed for session {session['sessionId']}\n")
+            current_step = progress['current_step']
+            if current_step > total_actions:
+                sys.stdout.write(_COMPLETE_BANNER.format_map({
+                    'total_actions': total_actions,
+                    'session_id': session_id
+                }))
+                sys.stderr.write(f"UAT Tracker: All steps completed for session {session_id}\n")
                 sys.exit(0)
             
             # Get guidance for next step
-            next_guidance = self.get_next_step_guidance(execution_plan, progress['current_step'])
+            next_guidance = self.get_next_step_guidance(execution_plan, current_step)
             if not next_guidance:
                 sys.stderr.write("UAT Tracker: Could not generate next step guidance\n")
                 sys.exit(0)
@@ -245,33 +272,21 @@ class UATExecutionTracker:
             expected_tool = next_guidance['tool']
             if tool_name == expected_tool:
                 # Tool matches, update progress and allow execution
+                step_number = next_guidance['step_number']
                 self.update_execution_progress(
-                    session['sessionId'], 
-                    next_guidance['step_number'], 
+                    session, 
+                    step_number, 
                     tool_name, 
                     'in_progress'
                 )
-                sys.stderr.write(f"UAT Tracker: Executing step {next_guidance['step_number']}/{next_guidance['total_steps']}: {tool_name}\n")
+                sys.stderr.write(f"UAT Tracker: Executing step {step_number}/{next_guidance['total_steps']}: {tool_name}\n")
             else:
                 # Tool doesn't match, provide guidance for correct next step
-                print("\n" + "⚠️ " + "="*50)
-                print("UAT EXECUTION SEQUENCE GUIDANCE")
-                print("="*52)
-                print(f"📍 Current Progress: {progress['current_step']-1}/{next_guidance['total_steps']} steps completed")
-                print(f"🎯 Next Required Step: {next_guidance['step_number']}/{next_guidance['total_steps']} ({next_guidance['progress_percentage']}%)")
-                print("")
-                print(f"**Expected Tool**: {expected_tool}")
-                print(f"**Attempted Tool**: {tool_name}")
-                print("")
-                print("🔸 **EXECUTE THIS EXACT FUNCTION CALL NEXT:**")
-                print("```")
-                print(next_guidance['function_call'])
-                print("```")
-                print("")
-                print(f"*Description*: {next_guidance['description']}")
-                print("")
-                print("⚡ **Please execute the expected tool above before proceeding**")
-                print("="*52 + "\n")
+                sys.stdout.write(_GUIDANCE_BANNER.format_map({
+                    **next_guidance,
+                    'completed_steps': current_step - 1,
+                    'attempted_tool': tool_name
+                }))
                 
                 sys.stderr.write(f"UAT Tracker: Tool mismatch - expected {expected_tool}, got {tool_name}\n")
             
@@ -283,5 +298,11 @@ class UATExecutionTracker:
             sys.exit(1)
 
 if __name__ == "__main__":
+    raw_input = sys.stdin.buffer.read()
+    
+    # Most tool calls are not MCP browser tools; exit before parsing or touching the session
+    if b'"mcp__playwright__' not in raw_input and b'"mcp__browsermcp__' not in raw_input:
+        sys.exit(0)
+        
     tracker = UATExecutionTracker()
-    tracker.process_hook()
\ No newline at end of file
+    tracker.process_hook(raw_input)
\ No newline at end of file
@@ -7,28 +7,25 @@ Generates reports and finalizes UAT sessions
 import json
 import sys
 import os
-from datetime import datetime
-import importlib.util
 
-# Import with proper module name handling
-try:
-    from uat_session_manager import UATSessionManager
-except ImportError:
-    # Handle hyphenated module name
-    spec = importlib.util.spec_from_file_location(
-        "uat_session_manager", 
-        os.path.join(os.path.dirname(__file__), "uat-session-manager.py")
-    )
-    uat_session_manager = importlib.util.module_from_spec(spec)
-    spec.loader.exec_module(uat_session_manager)
-    UATSessionManager = uat_session_manager.UATSessionManager
+# Import session manager
+from uat_session_manager import UATSessionManager, write_atomic
+
+# Action keywords mapped to VERA phases (first match wins)
+_ACTION_KEYWORDS = (
+    ('init', 'verify'),
+    ('navigate', 'execute'),
+    ('click', 'execute'),
+    ('fill', 'execute'),
+    ('screenshot', 'record')
+)
 
 class UATFinalizer:
     def __init__(self):
         self.manager = UATSessionManager()
         self.uat_root = '/mnt/c/projects/vrp-system/v4/uat'
         
-    def generate_report(self, session):
+    def generate_report(self, session, phases):
         """Generate comprehensive UAT report"""
         report = {
             'sessionId': session['sessionId'],
@@ -42,7 +39,7 @@ class UATFinalizer:
                 'failedSteps': session['metrics']['failedSteps'],
                 'successRate': 0
             },
-            'phases': self.extract_phases(session),
+            'phases': phases,
             'artifacts': session['artifacts'],
             'steps': session['steps']
         }
@@ -67,8 +64,9 @@ class UATFinalizer:
             f"uat-report-{session['sessionId']}.json"
         )
         
-        with open(report_file, 'w') as f:
-            json.dump(report, f, indent=2)
+        # Serialize once and write in a single call, via a temp file swapped in
+        # so readers never see a partial report
+        write_atomic(report_file, json.dumps(report, indent=2))
             
         return report_file
         
@@ -86,14 +84,13 @@ class UATFinalizer:
             action = step.get('action', '')
             
             # Map actions to VERA phases
-            if 'init' in action or phase == 'initialization':
+            if phase == 'initialization':
                 vera_phase = 'verify'
-            elif 'navigate' in action or 'click' in action or 'fill' in action:
-                vera_phase = 'execute'
-            elif 'screenshot' in action or phase == 'recording':
-                vera_phase = 'record'
             else:
-                vera_phase = 'analyze'
+                vera_phase = next(
+                    (vera for keyword, vera in _ACTION_KEYWORDS if keyword in action),
+                    'record' if phase == 'recording' else 'analyze'
+                )
                 
             phases[vera_phase]['steps'] += 1
             if step.get('status') == 'completed':
@@ -101,7 +98,7 @@ class UATFinalizer:
                 
         return phases
         
-    def create_summary_report(self, session, report_file):
+    def create_summary_report(self, session, report_file, phases):
         """Create human-readable summary report"""
         summary_lines = [
             "=" * 70,
@@ -147,7 +144,6 @@ class UATFinalizer:
         ])
         
         # Add phase breakdown
-        phases = self.extract_phases(session)
         summary_lines.extend([
             "VERA Phase Breakdown:",
             f"  Verify: {phases['verify']['passed']}/{phases['verify']['steps']} passed",
@@ -169,10 +165,10 @@ class UATFinalizer:
         
         summary_text = '\n'.join(summary_lines)
         
-        # Save summary
-        summary_file = report_file.replace('.json', '-summary.txt')
-        with open(summary_file, 'w') as f:
-            f.write(summary_text)
+        # Save summary file only on request; the text is always shown on stderr
+        if os.environ.get('UAT_EMIT_SUMMARY_FILE'):
+            summary_file = report_file.replace('.json', '-summary.txt')
+            write_atomic(summary_file, summary_text)
             
         return summary_text
         
@@ -180,7 +176,7 @@ class UATFinalizer:
         """Main hook processing logic following Claude Code hooks API"""
         try:
             # Read input from stdin
-            input_data = json.loads(sys.stdin.read())
+            input_data = json.loads(sys.stdin.buffer.read())
             
             # Load current session
             session = self.manager.load_session()
@@ -194,9 +190,10 @@ class UATFinalizer:
                     status='completed' if session['metrics']['failedSteps'] == 0 else 'failed'
                 )
                 
-                # Generate reports
-                report_file = self.generate_report(final_session)
-                summary = self.create_summary_report(final_session, report_file)
+                # Generate reports from a single pass over the steps
+                phases = self.extract_phases(final_session)
+                report_file = self.generate_report(final_session, phases)
+                summary = self.create_summary_report(final_session, report_file, phases)
                 
                 # Output summary to stderr so user can see it
                 sys.stderr.write("\n" + summary + "\n")
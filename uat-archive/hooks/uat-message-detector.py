@@ -7,9 +7,11 @@ Creates signal file for orchestrator to pick up
 import json
 import sys
 import os
-import re
 from datetime import datetime
 
+# Detection shares the session manager's keyword table
+from uat_session_manager import detect_uat_intent
+
 class UATMessageDetector:
     def __init__(self):
         self.uat_root = '/mnt/c/projects/vrp-system/v4/uat'
@@ -23,44 +25,14 @@ class UATMessageDetector:
         if not message:
             return False, None
             
-        message_lower = message.lower()
-        
-        # Must contain 'uat' keyword
-        if 'uat' not in message_lower:
-            return False, None
-            
-        # Scenario keyword mapping to scenario files
-        scenario_map = {
-            'login': 'login-flow',
-            'login-flow': 'login-flow',
-            'auth': 'login-flow',
-            'authentication': 'login-flow',
-            'vehicle': 'vehicle-crud',
-            'vehicle-crud': 'vehicle-crud',
-            'crud': 'vehicle-crud',
-            'create': 'vehicle-crud',
-            'update': 'vehicle-crud',
-            'delete': 'vehicle-crud',
-            'error': 'error-handling',
-            'error-handling': 'error-handling',
-            'handling': 'error-handling',
-            'validation': 'error-handling'
-        }
-        
-        # Find matching scenario
-        for keyword, scenario in scenario_map.items():
-            if keyword in message_lower:
-                return True, scenario
-                
-        # No scenario match found
-        return False, None
+        return detect_uat_intent(message)
     
-    def create_intent_signal(self, scenario, message):
+    def create_intent_signal(self, scenario, message, timestamp=None):
         """Create intent signal file for orchestrator"""
         intent_data = {
             'scenario': scenario,
             'message': message,
-            'timestamp': datetime.now().isoformat(),
+            'timestamp': timestamp or datetime.now().isoformat(),
             'detected_by': 'uat-message-detector'
         }
         
@@ -78,7 +50,8 @@ class UATMessageDetector:
         is_uat, scenario = self.detect_uat_intent(message)
         
         if is_uat and scenario:
-            intent_data = self.create_intent_signal(scenario, message)
+            timestamp = datetime.now().isoformat()
+            intent_data = self.create_intent_signal(scenario, message, timestamp)
             return True, intent_data
         
         return False, None
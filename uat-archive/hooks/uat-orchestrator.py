@@ -8,146 +8,228 @@ import json
 import sys
 import os
 import re
-import importlib.util
+import atexit
 
 sys.path.append(os.path.dirname(os.path.abspath(__file__)))
 
-# Import with proper module name handling
-try:
-    from uat_session_manager import UATSessionManager
-except ImportError:
-    # Handle hyphenated module name
-    import importlib.util
-    spec = importlib.util.spec_from_file_location(
-        "uat_session_manager", 
-        os.path.join(os.path.dirname(__file__), "uat-session-manager.py")
-    )
-    uat_session_manager = importlib.util.module_from_spec(spec)
-    spec.loader.exec_module(uat_session_manager)
-    UATSessionManager = uat_session_manager.UATSessionManager
+
+# Patterns compiled once at import instead of per call
+_SCENARIO_RE = re.compile(r'scenario\s+(\S+)')
+_UAT_CMD_RE = re.compile(r'node.*uat.*test|uat.*scenario|uat.*login|uat.*crud|uat.*init')
+_NODE_UAT_RE = re.compile(r'node.*uat.*scenario')
+
+# Test-type keywords in priority order, and one alternation that finds them all in a pass
+_TEST_TYPES = (
+    ('login', 'login-flow'),
+    ('vehicle', 'vehicle-crud'),
+    ('crud', 'vehicle-crud'),
+    ('error', 'error-handling')
+)
+_TEST_TYPE_RE = re.compile('|'.join(keyword for keyword, _ in _TEST_TYPES))
+
+# Plain-substring markers of a UAT scenario execution command
+_MCP_EXEC_MARKERS = (
+    'uat-test-runner.cjs scenario',
+    'UAT_MCP_REQUEST',
+    'MCP Navigation',
+    'MCP Click',
+    'MCP Fill',
+    'MCP Screenshot'
+)
+
+# Scenario objectives: the array literal, each {...} entry, its fields and string values
+_OBJECTIVES_BLOCK_RE = re.compile(r'objectives\s*[:=]\s*\[((?:[^\[\]]|\[[^\]]*\])*)\]')
+_OBJECTIVE_RE = re.compile(r'\{([^}]*)\}')
+_FIELD_RE = re.compile(r'(\w+)\s*:\s*(\[[^\]]*\]|"[^"]*"|\'[^\']*\')')
+_STRING_RE = re.compile(r'"([^"]*)"|\'([^\']*)\'')
+
+# Bump when the parser output changes so stale on-disk caches are ignored
+_OBJECTIVES_CACHE_VERSION = 2
+
+# Objective field name -> whether its value is a single string or an array of strings
+_OBJECTIVE_FIELDS = {
+    'id': 'quoted',
+    'title': 'quoted',
+    'category': 'quoted',
+    'priority': 'quoted',
+    'description': 'quoted',
+    'steps': 'array',
+    'dependencies': 'array',
+    'acceptance_criteria': 'array'
+}
+
+# stderr lines are queued and written in one call when the hook exits
+_log_buf = []
+
+def _log(msg):
+    """Queue a line for stderr"""
+    _log_buf.append(msg)
+
+@atexit.register
+def _flush_log():
+    """Write all queued stderr lines at once"""
+    if _log_buf:
+        sys.stderr.write('\n'.join(_log_buf) + '\n')
+        _log_buf.clear()
+
+_manager_cls = None
+
+def _get_manager_cls():
+    """Import the session manager on first use; non-UAT tool calls never need it"""
+    global _manager_cls
+    if _manager_cls is None:
+        from uat_session_manager import UATSessionManager
+        _manager_cls = UATSessionManager
+    return _manager_cls
+
+def _consume_json(path):
+    """Read and remove a one-shot JSON signal file; None if absent or unreadable"""
+    try:
+        with open(path, 'rb') as f:
+            data = f.read()
+    except FileNotFoundError:
+        return None
+    except OSError:
+        data = None
+        
+    # Whoever removes the file owns the signal, so concurrent hooks can't both consume it
+    try:
+        os.unlink(path)
+    except FileNotFoundError:
+        return None
+    except OSError:
+        pass
+        
+    try:
+        signal_data = json.loads(data)
+    except (TypeError, ValueError):
+        return None
+    return signal_data if isinstance(signal_data, dict) else None
 
 class UATOrchestrator:
+    # Parsed objectives keyed by scenario path, invalidated on (mtime_ns, size) change
+    _objectives_cache = {}
+    
+    # Screenshot directories already ensured by this process
+    _created_dirs = set()
+    
     def __init__(self):
-        self.manager = UATSessionManager()
+        self._manager = None
         self.uat_root = '/mnt/c/projects/vrp-system/v4/uat'
         
+        # Static paths under the UAT root, joined once
+        self.scenarios_dir = os.path.join(self.uat_root, 'scenarios')
+        self.screenshots_dir = os.path.join(self.uat_root, 'screenshots')
+        self.cache_dir = os.path.join(self.uat_root, '.cache')
+        
+        # One-shot UAT start signals: context file (set by Stop hook), then legacy intent file
+        self._context_file = os.path.join(self.uat_root, '.uat_context')
+        self._intent_file = os.path.join(self.uat_root, '.uat_intent')
+        
+    @property
+    def manager(self):
+        """Session manager, created on first access"""
+        if self._manager is None:
+            self._manager = _get_manager_cls()()
+        return self._manager
+        
     def load_scenario_objectives(self, scenario_name):
         """Load objectives from scenario file"""
         if not scenario_name or scenario_name == 'general-test':
             return []
             
-        scenario_path = os.path.join(self.uat_root, 'scenarios', f'{scenario_name}.cjs')
-        if not os.path.exists(scenario_path):
-            return []
-            
+        scenario_path = os.path.join(self.scenarios_dir, f'{scenario_name}.cjs')
         try:
-            # Read scenario file content
-            with open(scenario_path, 'r') as f:
-                content = f.read()
+            st = os.stat(scenario_path)
+        except OSError:
+            return []
             
-            # Extract objectives using simple parsing (avoid executing JS)
-            objectives = []
+        # Parsed objectives are cached per scenario file version (mtime + size)
+        cache_path = os.path.join(
+            self.cache_dir,
+            f'{scenario_name}.v{_OBJECTIVES_CACHE_VERSION}.{st.st_mtime_ns}.{st.st_size}.json'
+        )
             
-            # Look for objectives array in the module.exports
-            if 'objectives:' in content or 'objectives =' in content:
-                # Find the objectives array definition
-                objectives_start = -1
-                for i, line in enumerate(content.split('\n')):
-                    if 'objectives:' in line or 'objectives =' in line:
-                        objectives_start = i
-                        break
-                
-                if objectives_start >= 0:
-                    lines = content.split('\n')
-                    # Parse objectives array manually (simple bracket counting)
-                    bracket_count = 0
-                    in_objectives = False
-                    current_objective = {}
-                    current_field = None
+        try:
+            # Reuse objectives already parsed in this process while the file is unchanged
+            stamp = (st.st_mtime_ns, st.st_size)
+            cached = self._objectives_cache.get(scenario_path)
+            if cached and cached[0] == stamp:
+                objectives = cached[1]
+            else:
+                try:
+                    with open(cache_path, 'rb') as f:
+                        objectives = json.loads(f.read())
+                except (OSError, ValueError):
+                    # Stream the file and skip ahead to the objectives definition
+                    objectives = []
+                    with open(scenario_path, 'r', buffering=1 << 16) as f:
+                        for line in f:
+                            if 'objectives:' in line or 'objectives =' in line:
+                                # Parse from the definition line on; the prefix is never kept
+                                objectives = self._parse_objectives(line + f.read())
+                                break
                     
-                    for i in range(objectives_start, len(lines)):
-                        line = lines[i].strip()
-                        
-                        if '[' in line and not in_objectives:
-                            in_objectives = True
-                            bracket_count = line.count('[') - line.count(']')
-                            continue
-                            
-                        if not in_objectives:
-                            continue
-                            
-                        # Track bracket depth
-                        bracket_count += line.count('[') - line.count(']')
-                        bracket_count += line.count('{') - line.count('}')
-                        
-                        if bracket_count <= 0:
-                            # End of objectives array
-                            if current_objective and current_objective.get('id'):
-                                objectives.append(current_objective)
-                            break
-                            
-                        # Parse objective fields
-                        if 'id:' in line:
-                            if current_objective and current_objective.get('id'):
-                                objectives.append(current_objective)
-                            current_objective = {}
-                            current_objective['id'] = self._extract_quoted_value(line)
-                        elif 'title:' in line:
-                            current_objective['title'] = self._extract_quoted_value(line)
-                        elif 'category:' in line:
-                            current_objective['category'] = self._extract_quoted_value(line)
-                        elif 'priority:' in line:
-                            current_objective['priority'] = self._extract_quoted_value(line)
-                        elif 'description:' in line:
-                            current_objective['description'] = self._extract_quoted_value(line)
-                        elif 'steps:' in line:
-                            current_objective['steps'] = self._extract_array_value(line)
-                        elif 'dependencies:' in line:
-                            current_objective['dependencies'] = self._extract_array_value(line)
-                        elif 'acceptance_criteria:' in line:
-                            # This is an array that might span multiple lines
-                            current_field = 'acceptance_criteria'
-                            current_objective['acceptance_criteria'] = []
-                        elif current_field == 'acceptance_criteria' and '"' in line:
-                            criterion = self._extract_quoted_value(line)
-                            if criterion:
-                                current_objective['acceptance_criteria'].append(criterion)
-                        elif ']' in line and current_field == 'acceptance_criteria':
-                            current_field = None
+                    self._save_objectives_cache(scenario_name, cache_path, objectives)
                     
-                    # Add final objective if exists
-                    if current_objective and current_objective.get('id'):
-                        objectives.append(current_objective)
+                self._objectives_cache[scenario_path] = (stamp, objectives)
             
-            sys.stderr.write(f"UAT: Loaded {len(objectives)} objectives from {scenario_name}\n")
+            _log(f"UAT: Loaded {len(objectives)} objectives from {scenario_name}")
             return objectives
             
         except Exception as e:
-            sys.stderr.write(f"UAT: Failed to load objectives from {scenario_name}: {str(e)}\n")
+            _log(f"UAT: Failed to load objectives from {scenario_name}: {str(e)}")
             return []
     
-    def _extract_quoted_value(self, line):
-        """Extract quoted string value from a line"""
-        import re
-        match = re.search(r'["\']([^"\']*)["\']', line)
-        return match.group(1) if match else None
-    
-    def _extract_array_value(self, line):
-        """Extract array values from a line like steps: ["step1", "step2"]"""
-        import re
-        # Find content between brackets
-        match = re.search(r'\[(.*?)\]', line)
-        if match:
-            content = match.group(1)
-            # Extract quoted strings
-            items = re.findall(r'["\']([^"\']*)["\']', content)
-            return items
-        return []
+    def _save_objectives_cache(self, scenario_name, cache_path, objectives):
+        """Write parsed objectives to the cache; failures only cost a re-parse"""
+        try:
+            os.makedirs(self.cache_dir, exist_ok=True)
+            tmp_path = f"{cache_path}.{os.getpid()}.tmp"
+            with open(tmp_path, 'w') as f:
+                f.write(json.dumps(objectives, separators=(',', ':')))
+            os.replace(tmp_path, cache_path)
+            
+            # Drop entries for older versions of this scenario file (and older cache formats)
+            prefix = f'{scenario_name}.v'
+            current = os.path.basename(cache_path)
+            for name in os.listdir(self.cache_dir):
+                if name.startswith(prefix) and name != current and not name.endswith('.tmp'):
+                    try:
+                        os.remove(os.path.join(self.cache_dir, name))
+                    except FileNotFoundError:
+                        pass
+        except OSError as e:
+            _log(f"UAT: Failed to cache objectives: {str(e)}")
     
+    def _parse_objectives(self, content):
+        """Extract the objectives array literal with regexes (avoid executing JS)"""
+        block = _OBJECTIVES_BLOCK_RE.search(content)
+        if not block:
+            return []
+            
+        objectives = []
+        for body in _OBJECTIVE_RE.findall(block.group(1)):
+            objective = {}
+            for key, value in _FIELD_RE.findall(body):
+                kind = _OBJECTIVE_FIELDS.get(key)
+                if not kind:
+                    continue
+                items = [double or single for double, single in _STRING_RE.findall(value)]
+                if kind == 'array':
+                    objective[key] = items
+                else:
+                    objective[key] = items[0] if items else None
+                    
+            if objective.get('id'):
+                objectives.append(objective)
+                
+        return objectives
+        
     def initialize_objective_tracking(self, session, objectives):
-        """Initialize objective tracking in session state"""
+        """Initialize objective tracking in session state and return the updated session"""
         if not objectives:
-            return
+            return session
             
         objective_status = {}
         for objective in objectives:
@@ -180,45 +262,20 @@ class UATOrchestrator:
             }
         }
         
-        self.manager.update_session(session_update)
-        sys.stderr.write(f"UAT: Initialized tracking for {len(objectives)} objectives\n")
+        session = self.manager.update_session(session_update)
+        _log(f"UAT: Initialized tracking for {len(objectives)} objectives")
+        return session
         
     def should_init_uat(self, input_data):
         """
         Check if this tool call should initialize UAT
         Looks for UAT commands in Bash tool calls or checks for UAT intent signal
         """
-        # First check if there's a UAT context file (set by Stop hook)
-        uat_context_file = os.path.join(self.uat_root, '.uat_context')
-        if os.path.exists(uat_context_file):
-            try:
-                with open(uat_context_file, 'r') as f:
-                    context_data = json.loads(f.read())
-                    # Remove the context file after reading
-                    os.remove(uat_context_file)
-                    return True, context_data.get('scenario', 'general-test')
-            except:
-                # If file exists but can't read, remove it
-                try:
-                    os.remove(uat_context_file)
-                except:
-                    pass
-        
-        # Also check for legacy intent file
-        uat_intent_file = os.path.join(self.uat_root, '.uat_intent')
-        if os.path.exists(uat_intent_file):
-            try:
-                with open(uat_intent_file, 'r') as f:
-                    intent_data = json.loads(f.read())
-                    # Remove the intent file after reading
-                    os.remove(uat_intent_file)
-                    return True, intent_data.get('scenario', 'general-test')
-            except:
-                # If file exists but can't read, remove it
-                try:
-                    os.remove(uat_intent_file)
-                except:
-                    pass
+        # First check for a UAT context file (set by Stop hook), then the legacy intent file
+        for signal_file in (self._context_file, self._intent_file):
+            signal_data = _consume_json(signal_file)
+            if signal_data is not None:
+                return True, signal_data.get('scenario', 'general-test')
         
         # Check if UAT is already active via environment
         if os.environ.get('UAT_SESSION_ID'):
@@ -235,70 +292,20 @@ class UATOrchestrator:
         # Check command and description for UAT intent
         combined_text = f"{command} {description}".lower()
         
-        # Look for UAT-specific commands
-        uat_commands = [
-            'uat-test-runner',
-            'node.*uat.*test',
-            'uat.*scenario',
-            'uat.*login',
-            'uat.*crud',
-            'uat.*init'
-        ]
-        
-        for pattern in uat_commands:
-            if re.search(pattern, combined_text):
-                # Extract scenario from command if possible
-                scenario_match = re.search(r'scenario\s+(\S+)', combined_text)
-                if scenario_match:
-                    scenario = scenario_match.group(1)
-                    return True, scenario
-                    
-                # Check for specific test types
-                if 'login' in combined_text:
-                    return True, 'login-flow'
-                elif 'vehicle' in combined_text or 'crud' in combined_text:
-                    return True, 'vehicle-crud'
-                elif 'error' in combined_text:
-                    return True, 'error-handling'
-                    
-                return True, None
+        # Look for UAT-specific commands: literal check first, regex only if needed
+        if 'uat-test-runner' in combined_text or _UAT_CMD_RE.search(combined_text):
+            # Extract scenario from command if possible
+            scenario_match = _SCENARIO_RE.search(combined_text)
+            if scenario_match:
+                scenario = scenario_match.group(1)
+                return True, scenario
+                
+            # Check for specific test types: one scan, then pick by keyword priority
+            hits = set(_TEST_TYPE_RE.findall(combined_text))
+            return True, next((scenario for keyword, scenario in _TEST_TYPES if keyword in hits), None)
                 
         return False, None
         
-    def enhance_bash_command(self, input_data, session):
-        """Enhance Bash commands for UAT execution"""
-        tool_input = input_data.get('tool_input', {})
-        command = tool_input.get('command', '')
-        
-        # If running UAT command, ensure proper environment
-        if 'uat-test-runner' in command or 'uat' in command:
-            # Add session tracking
-            enhanced_command = f"""
-# UAT Session: {session['sessionId']}
-export UAT_SESSION_ID="{session['sessionId']}"
-export UAT_SCENARIO="{session['scenario']}"
-export UAT_PHASE="{session['phase']}"
-
-# Original command
-{command}
-
-# Capture exit code
-UAT_EXIT_CODE=$?
-
-# Log command result
-echo "UAT_RESULT: Command exited with code $UAT_EXIT_CODE"
-exit $UAT_EXIT_CODE
-"""
-            # Output enhanced command data via stdout (hook standard)
-            enhanced_data = input_data.copy()
-            enhanced_data['tool_input'] = tool_input.copy()
-            enhanced_data['tool_input']['command'] = enhanced_command.strip()
-            
-            # Return enhanced data for logging
-            return enhanced_data
-            
-        return input_data
-        
     def enhance_mcp_command(self, input_data, session):
         """Enhance Browser MCP and Playwright MCP commands for UAT"""
         tool_name = input_data.get('tool_name', '')
@@ -313,13 +320,11 @@ exit $UAT_EXIT_CODE
         elif 'screenshot' in tool_name:
             # Ensure screenshots are saved to UAT directory
             if 'downloadsDir' not in tool_input:
-                screenshots_dir = os.path.join(
-                    self.uat_root, 
-                    'screenshots',
-                    session['sessionId']
-                )
+                screenshots_dir = os.path.join(self.screenshots_dir, session['sessionId'])
                 # Ensure directory exists
-                os.makedirs(screenshots_dir, exist_ok=True)
+                if screenshots_dir not in self._created_dirs:
+                    os.makedirs(screenshots_dir, exist_ok=True)
+                    self._created_dirs.add(screenshots_dir)
                 tool_input['downloadsDir'] = screenshots_dir
                 
             # Add session prefix to screenshot name
@@ -327,12 +332,20 @@ exit $UAT_EXIT_CODE
                 tool_input['name'] = f"{session['sessionId']}-{tool_input['name']}"
                 
         # Set UAT environment variables for the command context
-        os.environ['UAT_SESSION_ID'] = session['sessionId']
-        os.environ['UAT_SCENARIO'] = session['scenario']
-        os.environ['UAT_PHASE'] = session['phase']
+        self._sync_env(session)
                 
         return input_data
         
+    def _sync_env(self, session):
+        """Export session identity to the environment, skipping unchanged variables"""
+        for key, value in (
+            ('UAT_SESSION_ID', session['sessionId']),
+            ('UAT_SCENARIO', session['scenario']),
+            ('UAT_PHASE', session['phase'])
+        ):
+            if os.environ.get(key) != value:
+                os.environ[key] = value
+        
     def should_execute_mcp_tools(self, input_data):
         """Check if this bash command contains UAT MCP requests"""
         tool_name = input_data.get('tool_name', '')
@@ -343,21 +356,10 @@ exit $UAT_EXIT_CODE
         command = tool_input.get('command', '')
         
         # Check for UAT scenario execution commands
-        uat_patterns = [
-            'uat-test-runner.cjs scenario',
-            'node.*uat.*scenario',
-            'UAT_MCP_REQUEST',
-            'MCP Navigation',
-            'MCP Click', 
-            'MCP Fill',
-            'MCP Screenshot'
-        ]
-        
-        for pattern in uat_patterns:
-            if pattern in command:
-                return True
-                
-        return False
+        if any(marker in command for marker in _MCP_EXEC_MARKERS):
+            return True
+            
+        return bool(_NODE_UAT_RE.search(command))
         
     def execute_uat_scenario(self, input_data, session):
         """Execute UAT scenario through proper test runner instead of hardcoded sequences"""
@@ -367,29 +369,39 @@ exit $UAT_EXIT_CODE
             
             # Check if this is a UAT scenario execution command
             if 'scenario login-flow' in command:
-                sys.stderr.write(f"UAT: Ensuring login-flow scenario executes through proper test runner\n")
+                _log(f"UAT: Ensuring login-flow scenario executes through proper test runner")
                 
                 # Instead of hardcoded sequences, ensure the UAT test runner is called
                 # The command should be: node uat-test-runner.cjs scenario login-flow
                 if 'uat-test-runner.cjs scenario login-flow' in command:
-                    sys.stderr.write(f"UAT: Proper test runner command detected - allowing execution\n")
+                    _log(f"UAT: Proper test runner command detected - allowing execution")
                     # Let the command execute normally to run the structured scenario
                     return True
                 else:
-                    sys.stderr.write(f"UAT: Command should be 'node uat-test-runner.cjs scenario login-flow'\n")
+                    _log(f"UAT: Command should be 'node uat-test-runner.cjs scenario login-flow'")
                     return False
                     
             return True
                 
         except Exception as e:
-            sys.stderr.write(f"UAT Scenario Execution Error: {str(e)}\n")
+            _log(f"UAT Scenario Execution Error: {str(e)}")
             return False
         
     def process_hook(self):
         """Main hook processing logic following Claude Code hooks API"""
         try:
             # Read input from stdin
-            input_data = json.loads(sys.stdin.read())
+            input_data = json.loads(sys.stdin.buffer.read())
+            
+            # Fast path: tools other than Bash/browser MCP can't start or drive UAT
+            # unless a session is flagged in the environment or a start signal is waiting
+            tool_name = input_data.get('tool_name', '')
+            if (tool_name != 'Bash'
+                    and not tool_name.startswith(('mcp__browsermcp__', 'mcp__playwright__'))
+                    and not os.environ.get('UAT_SESSION_ID')
+                    and not os.path.exists(self._context_file)
+                    and not os.path.exists(self._intent_file)):
+                sys.exit(0)
             
             # Load current session
             session = self.manager.load_session()
@@ -406,50 +418,51 @@ exit $UAT_EXIT_CODE
                     # Load and initialize objectives for this scenario
                     objectives = self.load_scenario_objectives(scenario)
                     if objectives:
-                        self.initialize_objective_tracking(session, objectives)
-                        # Reload session to get updated data
-                        session = self.manager.load_session()
+                        # update_session hands back the merged session, no reload needed
+                        session = self.initialize_objective_tracking(session, objectives)
                     
                     # Log initialization to stderr
-                    sys.stderr.write(f"UAT Session Initialized: {session['sessionId']}\n")
-                    sys.stderr.write(f"Scenario: {scenario}\n")
+                    _log(f"UAT Session Initialized: {session['sessionId']}")
+                    _log(f"Scenario: {scenario}")
                     if objectives:
-                        sys.stderr.write(f"Objectives: {len(objectives)} loaded and initialized\n")
+                        _log(f"Objectives: {len(objectives)} loaded and initialized")
                     
                     # Set environment variables for subsequent tools
-                    os.environ['UAT_SESSION_ID'] = session['sessionId']
-                    os.environ['UAT_SCENARIO'] = session['scenario']
-                    os.environ['UAT_PHASE'] = session['phase']
+                    self._sync_env(session)
             
             # If UAT session is active, enhance the command
             if session:
-                tool_name = input_data.get('tool_name', '')
                 tool_input = input_data.get('tool_input', {})
                 
                 if tool_name == 'Bash':
-                    enhanced_data = self.enhance_bash_command(input_data, session)
+                    # PreToolUse can't rewrite the command, so the wrapper isn't built here
                     # Log enhancement for debugging
-                    sys.stderr.write(f"UAT Enhanced Bash command for session {session['sessionId']}\n")
+                    _log(f"UAT Enhanced Bash command for session {session['sessionId']}")
                     
-                elif tool_name.startswith('mcp__browsermcp__') or tool_name.startswith('mcp__playwright__'):
+                elif tool_name.startswith(('mcp__browsermcp__', 'mcp__playwright__')):
                     self.enhance_mcp_command(input_data, session)
                     # Log enhancement for debugging
-                    sys.stderr.write(f"UAT Enhanced MCP tool {tool_name} for session {session['sessionId']}\n")
+                    _log(f"UAT Enhanced MCP tool {tool_name} for session {session['sessionId']}")
                     
-                # Update session phase based on tool
+                # Update session phase based on tool, writing only when it actually changes
                 if 'init' in tool_input.get('command', '') or 'init' in tool_name:
-                    self.manager.update_session({'phase': 'initialization'})
+                    new_phase = 'initialization'
                 elif 'navigate' in tool_name:
-                    self.manager.update_session({'phase': 'execution'})
+                    new_phase = 'execution'
                 elif 'screenshot' in tool_name:
-                    self.manager.update_session({'phase': 'recording'})
+                    new_phase = 'recording'
+                else:
+                    new_phase = None
+                    
+                if new_phase and new_phase != session.get('phase'):
+                    session = self.manager.update_session({'phase': new_phase})
             
             # Check if this is a UAT scenario execution that needs proper routing
             if session and self.should_execute_mcp_tools(input_data):
                 # Ensure UAT scenarios execute through proper test runner
                 scenario_valid = self.execute_uat_scenario(input_data, session)
                 if not scenario_valid:
-                    sys.stderr.write(f"UAT: Invalid scenario command - should use structured test runner\n")
+                    _log(f"UAT: Invalid scenario command - should use structured test runner")
             
             # For PreToolUse hooks, we don't modify the input - just enhance environment
             # Exit code 0 means continue normally
@@ -457,7 +470,7 @@ exit $UAT_EXIT_CODE
             
         except Exception as e:
             # Log error to stderr
-            sys.stderr.write(f"UAT Orchestrator Error: {str(e)}\n")
+            _log(f"UAT Orchestrator Error: {str(e)}")
             # Exit code 1 means non-blocking error
             sys.exit(1)
 
@@ -7,60 +7,97 @@ Processes bash tool results to detect MCP requests and provide structured execut
 import json
 import sys
 import os
-import importlib.util
+import re
+import atexit
 
-# Import MCP bridge
-try:
-    from uat_mcp_bridge import UATMCPBridge
-except ImportError:
-    spec = importlib.util.spec_from_file_location(
-        "uat_mcp_bridge", 
-        os.path.join(os.path.dirname(__file__), "uat-mcp-bridge.py")
-    )
-    uat_mcp_bridge = importlib.util.module_from_spec(spec)
-    spec.loader.exec_module(uat_mcp_bridge)
-    UATMCPBridge = uat_mcp_bridge.UATMCPBridge
+# stderr lines are queued and written in one call when the hook exits
+_log_buf = []
 
-# Import session manager
-try:
-    from uat_session_manager import UATSessionManager
-except ImportError:
-    spec = importlib.util.spec_from_file_location(
-        "uat_session_manager", 
-        os.path.join(os.path.dirname(__file__), "uat-session-manager.py")
-    )
-    uat_session_manager = importlib.util.module_from_spec(spec)
-    spec.loader.exec_module(uat_session_manager)
-    UATSessionManager = uat_session_manager.UATSessionManager
+def _log(msg):
+    """Queue a line for stderr"""
+    _log_buf.append(msg)
+
+@atexit.register
+def _flush_log():
+    """Write all queued stderr lines at once"""
+    if _log_buf:
+        sys.stderr.write('\n'.join(_log_buf) + '\n')
+        _log_buf.clear()
+
+_manager_cls = None
+
+def _get_manager_cls():
+    """Import the session manager on first use; non-UAT tool calls never need it"""
+    global _manager_cls
+    if _manager_cls is None:
+        from uat_session_manager import UATSessionManager
+        _manager_cls = UATSessionManager
+    return _manager_cls
+
+_bridge_cls = None
+
+def _get_bridge_cls():
+    """Import the MCP bridge on first use"""
+    global _bridge_cls
+    if _bridge_cls is None:
+        from uat_mcp_bridge import UATMCPBridge
+        _bridge_cls = UATMCPBridge
+    return _bridge_cls
+
+# UAT test runner command patterns; the plain runner name is checked with 'in'
+_RUNNER_RE = re.compile(r'node.*uat.*scenario|uat.*scenario.*(?:login-flow|vehicle-crud|error-handling)')
+
+# Guidance banner rendered with str.format_map
+_GUIDANCE_BANNER = "\n".join([
+    "\n" + "🚀 " + "="*50,
+    "UAT STRUCTURED EXECUTION GUIDANCE",
+    "="*52,
+    "Session: {session_id}",
+    "Mode: {execution_mode}",
+    "Methodology: {methodology}",
+    "Total Actions: {total_actions}",
+    "",
+    "⚡ **CRITICAL**: Execute the MCP tools in the exact sequence",
+    "provided by the test runner. Do not skip steps or change order.",
+    "",
+    "📋 **NEXT STEPS**:",
+    "1. Execute each MCP tool call in sequence",
+    "2. Wait for completion before proceeding to next step",
+    "3. Verify each step succeeds before continuing",
+    "4. Follow the VERA methodology throughout",
+    "",
+    "🎯 **EXECUTION PLAN READY** - Begin MCP tool execution now",
+    "="*52 + "\n"
+]) + "\n"
 
 class UATPostToolBridge:
     def __init__(self):
-        self.bridge = UATMCPBridge()
-        self.manager = UATSessionManager()
+        self._manager = None
+        self._bridge = None
         self.uat_root = '/mnt/c/projects/vrp-system/v4/uat'
         
+    @property
+    def manager(self):
+        """Session manager, imported and created on first access"""
+        if self._manager is None:
+            self._manager = _get_manager_cls()()
+        return self._manager
+        
+    @property
+    def bridge(self):
+        """MCP bridge sharing this hook's session manager and log buffer, created on first access"""
+        if self._bridge is None:
+            self._bridge = _get_bridge_cls()(self.manager, log=_log)
+        return self._bridge
+        
     def is_uat_test_runner_command(self, tool_input):
         """Check if this was a UAT test runner bash command"""
         if not tool_input:
             return False
             
-        command = tool_input.get('command', '')
-        
         # Check for UAT test runner patterns
-        uat_patterns = [
-            'uat-test-runner.cjs',
-            'node.*uat.*scenario',
-            'uat.*scenario.*login-flow',
-            'uat.*scenario.*vehicle-crud', 
-            'uat.*scenario.*error-handling'
-        ]
-        
-        import re
-        for pattern in uat_patterns:
-            if re.search(pattern, command):
-                return True
-                
-        return False
+        command = tool_input.get('command', '')
+        return 'uat-test-runner.cjs' in command or bool(_RUNNER_RE.search(command))
     
     def contains_mcp_requests(self, tool_result):
         """Check if tool result contains MCP execution requests"""
@@ -111,14 +148,14 @@ class UATPostToolBridge:
                 
             return True
         except Exception as e:
-            sys.stderr.write(f"Failed to save execution state: {str(e)}\n")
+            _log(f"Failed to save execution state: {str(e)}")
             return False
     
     def process_hook(self):
         """Main PostToolUse hook processing logic"""
         try:
             # Read input from stdin
-            input_data = json.loads(sys.stdin.read())
+            input_data = json.loads(sys.stdin.buffer.read())
             
             # Check if this is a bash tool result
             tool_name = input_data.get('tool_name', '')
@@ -138,16 +175,16 @@ class UATPostToolBridge:
             # Check if result contains MCP requests
             if not self.contains_mcp_requests(tool_result):
                 # No MCP requests found, exit normally
-                sys.stderr.write("UAT PostTool Bridge: No MCP requests detected in output\n")
+                _log("UAT PostTool Bridge: No MCP requests detected in output")
                 sys.exit(0)
             
             # Load current session
             session = self.manager.load_session()
             if not session:
-                sys.stderr.write("UAT PostTool Bridge: No active UAT session found\n")
+                _log("UAT PostTool Bridge: No active UAT session found")
                 sys.exit(0)
             
-            sys.stderr.write(f"UAT PostTool Bridge: Processing MCP requests for session {session['sessionId']}\n")
+            _log(f"UAT PostTool Bridge: Processing MCP requests for session {session['sessionId']}")
             
             # Use MCP bridge to process the output
             bridge_result = self.bridge.process_bash_output(input_data)
@@ -163,38 +200,20 @@ class UATPostToolBridge:
                     # Update session phase
                     self.manager.update_session({'phase': 'mcp_execution_ready'})
                     
-                    # Output structured execution guidance
-                    print("\n" + "🚀 " + "="*50)
-                    print("UAT STRUCTURED EXECUTION GUIDANCE")
-                    print("="*52)
-                    print(f"Session: {guidance['session_id']}")
-                    print(f"Mode: {guidance['execution_mode']}")
-                    print(f"Methodology: {guidance['methodology']}")
-                    print(f"Total Actions: {guidance['total_actions']}")
-                    print("")
-                    print("⚡ **CRITICAL**: Execute the MCP tools in the exact sequence")
-                    print("provided by the test runner. Do not skip steps or change order.")
-                    print("")
-                    print("📋 **NEXT STEPS**:")
-                    print("1. Execute each MCP tool call in sequence")
-                    print("2. Wait for completion before proceeding to next step")
-                    print("3. Verify each step succeeds before continuing")
-                    print("4. Follow the VERA methodology throughout")
-                    print("")
-                    print("🎯 **EXECUTION PLAN READY** - Begin MCP tool execution now")
-                    print("="*52 + "\n")
+                    # Output structured execution guidance in one write
+                    sys.stdout.write(_GUIDANCE_BANNER.format_map(guidance))
                     
-                    sys.stderr.write(f"UAT PostTool Bridge: Provided structured execution guidance\n")
+                    _log(f"UAT PostTool Bridge: Provided structured execution guidance")
                 else:
-                    sys.stderr.write("UAT PostTool Bridge: Failed to create execution guidance\n")
+                    _log("UAT PostTool Bridge: Failed to create execution guidance")
             else:
-                sys.stderr.write("UAT PostTool Bridge: MCP bridge processing failed\n")
+                _log("UAT PostTool Bridge: MCP bridge processing failed")
             
             # Exit successfully
             sys.exit(0)
             
         except Exception as e:
-            sys.stderr.write(f"UAT PostTool Bridge Error: {str(e)}\n")
+            _log(f"UAT PostTool Bridge Error: {str(e)}")
             sys.exit(1)
 
 if __name__ == "__main__":
@@ -8,25 +8,86 @@ import json
 import sys
 import os
 import re
-from datetime import datetime
-import importlib.util
+from collections import Counter
 
-# Import with proper module name handling
-try:
-    from uat_session_manager import UATSessionManager
-except ImportError:
-    # Handle hyphenated module name
-    spec = importlib.util.spec_from_file_location(
-        "uat_session_manager", 
-        os.path.join(os.path.dirname(__file__), "uat-session-manager.py")
-    )
-    uat_session_manager = importlib.util.module_from_spec(spec)
-    spec.loader.exec_module(uat_session_manager)
-    UATSessionManager = uat_session_manager.UATSessionManager
+# Import session manager
+from uat_session_manager import UATSessionManager
+
+# Tool output patterns, compiled once at import and keyed by the marker each one needs
+_ERROR_PATTERNS = tuple((marker, re.compile(pattern, re.IGNORECASE)) for marker, pattern in (
+    ('err_emoji', r'❌\s*(.+)'),
+    ('error', r'Error:\s*(.+)'),
+    ('failed', r'Failed:\s*(.+)'),
+    ('exit', r'UAT_RESULT:.*exited with code (\d+)')
+))
+_SCREENSHOT_PATTERN = re.compile(r'Screenshot.*saved.*[:\s]+(.+\.png)', re.IGNORECASE)
+_SUCCESS_PATTERNS = tuple((marker, re.compile(pattern)) for marker, pattern in (
+    ('ok_emoji', r'✅\s*(.+)'),
+    ('success', r'Success:\s*(.+)'),
+    ('passed', r'Passed:\s*(.+)')
+))
+
+# One pass over the output finds which markers occur; only their patterns are run
+_MARKER_RE = re.compile(
+    r'(?P<err_emoji>❌)|(?P<error>Error:)|(?P<failed>Failed:)|(?P<exit>UAT_RESULT:)'
+    r'|(?P<shot>Screenshot)|(?P<ok_emoji>✅)|(?P<success>Success:)|(?P<passed>Passed:)',
+    re.IGNORECASE
+)
+
+# Substring -> action tables, checked in order (first match wins)
+_RUNNER_STEP_ACTIONS = (
+    ('login', 'login'),
+    ('scenario', 'scenario'),
+    ('init', 'init'),
+    ('crud', 'crud')
+)
+_TOOL_STEP_ACTIONS = (
+    ('navigate', 'navigate'),
+    ('click', 'click'),
+    ('fill', 'fill'),
+    ('screenshot', 'screenshot')
+)
+_RUNNER_COMMAND_ACTIONS = (
+    ('init', 'uat-init'),
+    ('login', 'uat-login'),
+    ('crud', 'uat-crud'),
+    ('scenario', 'uat-scenario')
+)
+# Browser tool actions with the tool_input fields recorded in step details
+_TOOL_COMMAND_ACTIONS = (
+    ('navigate', 'browser-navigate', ('url',)),
+    ('screenshot', 'browser-screenshot', ('name',)),
+    ('click', 'browser-click', ('selector',)),
+    ('fill', 'browser-fill', ('selector', 'value'))
+)
+
+# UAT test runner sub-command keywords found in one pass (lookahead keeps overlaps like 'loginit')
+_RUNNER_KEYWORD_RE = re.compile('(?=(login|scenario|init|crud))')
+
+def _runner_keywords(command):
+    """Sub-command keywords in a UAT test runner command, or None for other commands"""
+    if 'uat-test-runner' not in command:
+        return None
+    return {match.group(1) for match in _RUNNER_KEYWORD_RE.finditer(command)}
+
+# Markers anywhere in a tool's input that identify a state verification call
+_VERIFY_MARKERS = ('verify_state', 'healthCheck')
+
+def _contains_marker(value, markers=_VERIFY_MARKERS):
+    """Check JSON keys and string values, nested or not, for any of the markers"""
+    if isinstance(value, str):
+        return any(marker in value for marker in markers)
+    if isinstance(value, dict):
+        return any(_contains_marker(key, markers) or _contains_marker(item, markers)
+                   for key, item in value.items())
+    if isinstance(value, list):
+        return any(_contains_marker(item, markers) for item in value)
+    return False
 
 class UATProgressTracker:
     def __init__(self):
-        self.manager = UATSessionManager()
+        # Session writes are batched and flushed once per hook call
+        self.manager = UATSessionManager(autoflush=False)
         self.uat_root = '/mnt/c/projects/vrp-system/v4/uat'
         
     def update_objective_progress(self, session, step_action, step_result):
@@ -39,20 +100,19 @@ class UATProgressTracker:
         status = objectives_data.get('status', {})
         
         # Find objectives that include this step action
+        step_status = step_result.get('status')
         for definition in definitions:
-            obj_id = definition['id']
-            obj_steps = definition.get('steps', [])
-            
-            if step_action in obj_steps and obj_id in status:
-                obj_status = status[obj_id]
-                
+            if step_action not in definition.get('steps', []):
+                continue
+            obj_status = status.get(definition['id'])
+            if obj_status is not None:
                 # Mark objective as in progress if not already
                 if obj_status['status'] == 'pending':
                     obj_status['status'] = 'in_progress'
-                    obj_status['startTime'] = datetime.now().isoformat()
+                    obj_status['startTime'] = self.manager.timestamp()
                 
                 # Track completed step if successful
-                if step_result.get('status') == 'completed':
+                if step_status == 'completed':
                     if step_action not in obj_status['completedSteps']:
                         obj_status['completedSteps'].append(step_action)
                         
@@ -62,13 +122,13 @@ class UATProgressTracker:
                         # Check if objective is complete
                         if len(obj_status['completedSteps']) == obj_status['totalSteps']:
                             obj_status['status'] = 'completed'
-                            obj_status['endTime'] = datetime.now().isoformat()
+                            obj_status['endTime'] = self.manager.timestamp()
                             sys.stderr.write(f"UAT: Objective completed: {definition['title']}\n")
                 
-                elif step_result.get('status') == 'failed':
+                elif step_status == 'failed':
                     # Step failed, mark objective as failed
                     obj_status['status'] = 'failed'
-                    obj_status['endTime'] = datetime.now().isoformat()
+                    obj_status['endTime'] = self.manager.timestamp()
                     if step_result.get('error'):
                         obj_status['failedCriteria'].append(f"Step '{step_action}' failed: {step_result['error']}")
                     sys.stderr.write(f"UAT: Objective failed: {definition['title']}\n")
@@ -84,13 +144,11 @@ class UATProgressTracker:
         status = objectives_data.get('status', {})
         summary = objectives_data.get('summary', {})
         
-        # Count objectives by status
+        # Count objectives by status in a single pass
+        counts = Counter(s['status'] for s in status.values())
         summary['total'] = len(status)
-        summary['completed'] = len([s for s in status.values() if s['status'] == 'completed'])
-        summary['failed'] = len([s for s in status.values() if s['status'] == 'failed'])
-        summary['in_progress'] = len([s for s in status.values() if s['status'] == 'in_progress'])
-        summary['pending'] = len([s for s in status.values() if s['status'] == 'pending'])
-        summary['blocked'] = len([s for s in status.values() if s['status'] == 'blocked'])
+        for bucket in ('completed', 'failed', 'in_progress', 'pending', 'blocked'):
+            summary[bucket] = counts[bucket]
         
         # Calculate success rate
         if summary['total'] > 0:
@@ -100,41 +158,25 @@ class UATProgressTracker:
     
     def get_step_action_from_tool(self, tool_name, tool_input):
         """Map tool calls to step actions for objective tracking"""
-        action_mapping = {
-            'browser-navigate': 'navigate',
-            'browser-click': 'click', 
-            'browser-fill': 'fill',
-            'browser-screenshot': 'screenshot',
-            'uat-init': 'init',
-            'uat-login': 'login',
-            'uat-scenario': 'scenario'
-        }
+        keywords = _runner_keywords(tool_input.get('command', '')) if tool_name == 'Bash' else None
+        return self._objective_action(tool_name, tool_input, keywords)
         
-        # First try direct mapping
+    def _objective_action(self, tool_name, tool_input, keywords):
+        """Map a tool call to its objective step action, given its runner keywords"""
         if tool_name == 'Bash':
-            command = tool_input.get('command', '')
-            if 'uat-test-runner' in command:
-                if 'login' in command:
-                    return 'login'
-                elif 'scenario' in command:
-                    return 'scenario'
-                elif 'init' in command:
-                    return 'init'
-                elif 'crud' in command:
-                    return 'crud'
-        
-        # Browser action mapping
-        elif 'navigate' in tool_name:
-            return 'navigate'
-        elif 'click' in tool_name:
-            return 'click'
-        elif 'fill' in tool_name:
-            return 'fill'
-        elif 'screenshot' in tool_name:
-            return 'screenshot'
+            # UAT test runner sub-commands, in priority order
+            if keywords:
+                for keyword, action in _RUNNER_STEP_ACTIONS:
+                    if keyword in keywords:
+                        return action
+        else:
+            # Browser action mapping
+            for keyword, action in _TOOL_STEP_ACTIONS:
+                if keyword in tool_name:
+                    return action
             
         # For verify_state actions, check for health check patterns
-        if 'verify_state' in str(tool_input) or 'healthCheck' in str(tool_input):
+        if _contains_marker(tool_input):
             return 'verify_state'
             
         return 'unknown'
@@ -151,37 +193,28 @@ class UATProgressTracker:
         if not output:
             return results
             
-        # Check for errors
-        error_patterns = [
-            r'❌\s*(.+)',
-            r'Error:\s*(.+)',
-            r'Failed:\s*(.+)',
-            r'UAT_RESULT:.*exited with code (\d+)'
-        ]
+        # Scan once for markers; output without any skips all pattern work
+        present = {match.lastgroup for match in _MARKER_RE.finditer(output)}
         
-        for pattern in error_patterns:
-            match = re.search(pattern, output, re.IGNORECASE)
+        # Check for errors
+        for marker, pattern in _ERROR_PATTERNS:
+            match = marker in present and pattern.search(output)
             if match:
                 results['hasError'] = True
                 results['errorMessage'] = match.group(1)
                 break
                 
         # Extract screenshots
-        screenshot_pattern = r'Screenshot.*saved.*[:\s]+(.+\.png)'
-        for match in re.finditer(screenshot_pattern, output, re.IGNORECASE):
-            results['screenshots'].append(match.group(1))
+        if 'shot' in present:
+            for match in _SCREENSHOT_PATTERN.finditer(output):
+                results['screenshots'].append(match.group(1))
             
         # Extract success indicators
-        success_patterns = [
-            r'✅\s*(.+)',
-            r'Success:\s*(.+)',
-            r'Passed:\s*(.+)'
-        ]
-        
         results['successMessages'] = []
-        for pattern in success_patterns:
-            for match in re.finditer(pattern, output):
-                results['successMessages'].append(match.group(1))
+        for marker, pattern in _SUCCESS_PATTERNS:
+            if marker in present:
+                for match in pattern.finditer(output):
+                    results['successMessages'].append(match.group(1))
                 
         return results
         
@@ -199,41 +232,28 @@ class UATProgressTracker:
             'details': {}
         }
         
-        # Determine action type
+        # Determine action type, parsing a runner command's keywords only once
+        keywords = None
         if tool_name == 'Bash':
             command = tool_input.get('command', '')
+            keywords = _runner_keywords(command)
             if 'screenshot' in command:
                 step['action'] = 'screenshot'
             elif 'navigate' in command:
                 step['action'] = 'navigate'
-            elif 'uat-test-runner' in command:
-                step['action'] = 'uat-command'
+            elif keywords is not None:
                 # Extract specific UAT command
-                if 'init' in command:
-                    step['action'] = 'uat-init'
-                elif 'login' in command:
-                    step['action'] = 'uat-login'
-                elif 'crud' in command:
-                    step['action'] = 'uat-crud'
-                elif 'scenario' in command:
-                    step['action'] = 'uat-scenario'
-                    
-        elif 'navigate' in tool_name:
-            step['action'] = 'browser-navigate'
-            step['details']['url'] = tool_input.get('url', '')
-            
-        elif 'screenshot' in tool_name:
-            step['action'] = 'browser-screenshot'
-            step['details']['name'] = tool_input.get('name', '')
-            
-        elif 'click' in tool_name:
-            step['action'] = 'browser-click'
-            step['details']['selector'] = tool_input.get('selector', '')
-            
-        elif 'fill' in tool_name:
-            step['action'] = 'browser-fill'
-            step['details']['selector'] = tool_input.get('selector', '')
-            step['details']['value'] = tool_input.get('value', '')
+                step['action'] = next(
+                    (action for keyword, action in _RUNNER_COMMAND_ACTIONS if keyword in keywords),
+                    'uat-command'
+                )
+        else:
+            for keyword, action, fields in _TOOL_COMMAND_ACTIONS:
+                if keyword in tool_name:
+                    step['action'] = action
+                    for field in fields:
+                        step['details'][field] = tool_input.get(field, '')
+                    break
             
         # Extract results from tool response
         output_text = str(tool_response)
@@ -253,19 +273,15 @@ class UATProgressTracker:
         # Track screenshots
         if results['screenshots']:
             step['details']['screenshots'] = results['screenshots']
-            # Add to session artifacts
-            for screenshot in results['screenshots']:
-                self.manager.update_session({
-                    'artifacts': {
-                        'screenshots': session['artifacts']['screenshots'] + [screenshot]
-                    }
-                })
+            # Add to session artifacts in one extend
+            session['artifacts']['screenshots'].extend(results['screenshots'])
+            self.manager.save_session(session)
                 
         # Add step to session
         self.manager.add_step(step)
         
         # Update objective progress if session has objectives
-        step_action = self.get_step_action_from_tool(tool_name, tool_input)
+        step_action = self._objective_action(tool_name, tool_input, keywords)
         if step_action != 'unknown':
             self.update_objective_progress(session, step_action, step)
         
@@ -274,12 +290,19 @@ class UATProgressTracker:
     def process_hook(self):
         """Main hook processing logic following Claude Code hooks API"""
         try:
+            # No active UAT session is the common case; skip reading and parsing stdin
+            if not os.path.exists(self.manager.current_session_file):
+                sys.exit(0)
+                
             # Read input from stdin
-            input_data = json.loads(sys.stdin.read())
+            input_data = json.loads(sys.stdin.buffer.read())
             
             # Only process if UAT session is active
             session = self.manager.load_session()
             if session:
+                # One timestamp for every record this call writes
+                self.manager.pin_timestamp()
+                
                 # Track the execution
                 step = self.track_execution(input_data, session)
                 
@@ -300,6 +323,9 @@ class UATProgressTracker:
                     completion = metrics['completedSteps'] / metrics['totalSteps']
                     if completion >= 1.0:
                         self.manager.update_session({'phase': 'analyzing'})
+                        
+                # Persist everything this call changed in one write
+                self.manager.flush()
             
             # PostToolUse hooks should exit with code 0 for success
             sys.exit(0)
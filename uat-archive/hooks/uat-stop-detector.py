@@ -8,21 +8,15 @@ import json
 import sys
 import os
 import re
-import importlib.util
+from collections import deque
 from datetime import datetime
 
-# Import with proper module name handling
-try:
-    from uat_session_manager import UATSessionManager
-except ImportError:
-    # Handle hyphenated module name
-    spec = importlib.util.spec_from_file_location(
-        "uat_session_manager", 
-        os.path.join(os.path.dirname(__file__), "uat-session-manager.py")
-    )
-    uat_session_manager = importlib.util.module_from_spec(spec)
-    spec.loader.exec_module(uat_session_manager)
-    UATSessionManager = uat_session_manager.UATSessionManager
+# Import session manager
+from uat_session_manager import UATSessionManager
+
+# Only the transcript's last lines are inspected, read from this many trailing bytes
+_TAIL_BYTES = 64 * 1024
+_TAIL_LINES = 10
 
 class UATStopDetector:
     def __init__(self):
@@ -31,18 +25,32 @@ class UATStopDetector:
         
     def analyze_transcript(self, transcript_path):
         """Analyze conversation transcript for UAT intent"""
-        if not os.path.exists(transcript_path):
-            return False, None, None
-            
         try:
-            with open(transcript_path, 'r') as f:
-                lines = f.readlines()
+            try:
+                f = open(transcript_path, 'rb')
+            except FileNotFoundError:
+                return False, None, None
+                
+            with f:
+                # Seek near the end instead of reading the whole transcript
+                offset = max(0, os.fstat(f.fileno()).st_size - _TAIL_BYTES)
+                f.seek(offset)
+                if offset:
+                    # Drop the partial line the seek landed in
+                    f.readline()
+                lines = deque(f, maxlen=_TAIL_LINES)
+                
+                # Very long lines can leave too few in the tail; fall back to a full scan
+                if offset and len(lines) < _TAIL_LINES:
+                    f.seek(0)
+                    lines = deque(f, maxlen=_TAIL_LINES)
                 
             # Look for recent user messages (last 3 messages)
             user_messages = []
-            for line in lines[-10:]:  # Check last 10 lines for user messages
+            for line in lines:  # Check last 10 lines for user messages
                 try:
-                    data = json.loads(line.strip())
+                    # json.loads takes the raw bytes and ignores the trailing newline
+                    data = json.loads(line)
                     if data.get('role') == 'user':
                         content = data.get('content', '')
                         if isinstance(content, list):
@@ -54,7 +62,7 @@ class UATStopDetector:
                         else:
                             text_content = content
                         user_messages.append(text_content)
-                except (json.JSONDecodeError, KeyError):
+                except (ValueError, KeyError):
                     continue
                     
             # Analyze recent messages for UAT intent
@@ -110,7 +118,7 @@ class UATStopDetector:
         """Main Stop hook processing logic"""
         try:
             # Read input from stdin
-            input_data = json.loads(sys.stdin.read())
+            input_data = json.loads(sys.stdin.buffer.read())
             
             # Get transcript path
             transcript_path = input_data.get('transcript_path')
@@ -0,0 +1,334 @@
+#!/usr/bin/env python3
+"""
+UAT MCP Request Bridge - Converts test runner MCP requests to structured execution
+Bridges the gap between test runner console output and Claude Code MCP tool execution
+"""
+
+import json
+import sys
+import os
+from datetime import datetime
+
+# Import session manager
+from uat_session_manager import UATSessionManager, write_atomic
+
+# Delimiters of the request blocks emitted by the test runner
+_BLOCK_PREFIX = '=== UAT '
+_MCP_START = '=== UAT MCP EXECUTION REQUEST ===\n'
+_MCP_END = '\n=== END UAT MCP REQUEST ==='
+_VALIDATION_START = '=== UAT VALIDATION MCP REQUEST ===\n'
+_VALIDATION_END = '\n=== END VALIDATION MCP REQUEST ==='
+
+# Parameter value formatters by JSON value type, anything else falls back to repr
+_FMT = {
+    str: lambda value: f'"{value}"',
+    bool: lambda value: str(value).lower(),
+    int: str,
+    float: str,
+    # For complex objects, use JSON representation
+    dict: json.dumps
+}
+
+def _extract_blocks(text, start_tag, end_tag):
+    """Yield the body of each start_tag ... end_tag block in text, in order"""
+    i = text.find(start_tag)
+    while i != -1:
+        body_start = i + len(start_tag)
+        j = text.find(end_tag, body_start)
+        if j == -1:
+            return
+        yield text[body_start:j]
+        i = text.find(start_tag, j + len(end_tag))
+
+def _scan_request_blocks(text):
+    """Collect MCP and validation block bodies in a single pass over text"""
+    kinds = ((_MCP_START, _MCP_END), (_VALIDATION_START, _VALIDATION_END))
+    bodies = ([], [])
+    # Per kind, where the previous block ended; -1 once no end tag remains
+    resume = [0, 0]
+    
+    i = text.find(_BLOCK_PREFIX)
+    while i != -1:
+        for k, (start_tag, end_tag) in enumerate(kinds):
+            if text.startswith(start_tag, i):
+                if resume[k] != -1 and i >= resume[k]:
+                    body_start = i + len(start_tag)
+                    j = text.find(end_tag, body_start)
+                    if j == -1:
+                        resume[k] = -1
+                    else:
+                        bodies[k].append(text[body_start:j])
+                        resume[k] = j + len(end_tag)
+                break
+        i = text.find(_BLOCK_PREFIX, i + len(_BLOCK_PREFIX))
+        
+    return bodies
+
+def _stderr_line(msg):
+    """Write one log line straight to stderr"""
+    sys.stderr.write(msg + '\n')
+
+class UATMCPBridge:
+    # Session directories already ensured by this process
+    _created_dirs = set()
+    
+    def __init__(self, manager=None, log=None):
+        # Reuse the caller's session manager (and its loaded session) when given
+        self.manager = manager or UATSessionManager()
+        self.uat_root = '/mnt/c/projects/vrp-system/v4/uat'
+        
+        # Log lines go to the caller's logger when given, so a hook keeps one ordered stream
+        self._log = log or _stderr_line
+        
+    def parse_requests(self, blocks, request_type):
+        """Parse request block bodies, keeping those of the given type"""
+        requests = []
+        marker = f'"{request_type}"'
+        
+        for block in blocks:
+            # Blocks that never mention the type can't match; skip parsing them
+            if marker not in block:
+                continue
+            try:
+                # Parse the JSON content
+                request_data = json.loads(block.strip())
+                if request_data.get('type') == request_type:
+                    requests.append(request_data)
+            except json.JSONDecodeError:
+                continue
+                
+        return requests
+        
+    def extract_requests_from_output(self, bash_output):
+        """Extract MCP and validation requests from a single scan of the output"""
+        mcp_blocks, validation_blocks = _scan_request_blocks(bash_output)
+        return (
+            self.parse_requests(mcp_blocks, 'UAT_MCP_EXECUTION_REQUEST'),
+            self.parse_requests(validation_blocks, 'UAT_VALIDATION_MCP_REQUEST')
+        )
+        
+    def extract_mcp_requests_from_output(self, bash_output):
+        """Extract MCP requests from test runner console output"""
+        return self.parse_requests(
+            _extract_blocks(bash_output, _MCP_START, _MCP_END),
+            'UAT_MCP_EXECUTION_REQUEST'
+        )
+    
+    def extract_validation_requests_from_output(self, bash_output):
+        """Extract validation requests from test runner console output"""
+        return self.parse_requests(
+            _extract_blocks(bash_output, _VALIDATION_START, _VALIDATION_END),
+            'UAT_VALIDATION_MCP_REQUEST'
+        )
+    
+    def create_structured_execution_plan(self, mcp_requests, validation_requests, timestamp=None):
+        """Create a structured execution plan from MCP and validation requests"""
+        execution_plan = {
+            'type': 'UAT_STRUCTURED_EXECUTION_PLAN',
+            'timestamp': timestamp or datetime.now().isoformat(),
+            'mcp_actions': len(mcp_requests),
+            'validation_actions': len(validation_requests),
+            'total_actions': len(mcp_requests) + len(validation_requests),
+            'sequence': []
+        }
+        
+        # Combine and sequence MCP and validation requests
+        # MCP requests typically come first, followed by validations
+        sequence_number = 1
+        
+        for mcp_request in mcp_requests:
+            execution_plan['sequence'].append({
+                'step': sequence_number,
+                'type': 'mcp_execution',
+                'tool': mcp_request.get('tool', ''),
+                'params': mcp_request.get('params', {}),
+                'description': mcp_request.get('description', ''),
+                'session_id': mcp_request.get('sessionId', ''),
+                'timestamp': mcp_request.get('timestamp', ''),
+                'status': 'pending'
+            })
+            sequence_number += 1
+            
+        for validation_request in validation_requests:
+            execution_plan['sequence'].append({
+                'step': sequence_number,
+                'type': 'validation_execution',
+                'tool': validation_request.get('tool', ''),
+                'params': validation_request.get('params', {}),
+                'description': validation_request.get('description', ''),
+                'session_id': validation_request.get('sessionId', ''),
+                'timestamp': validation_request.get('timestamp', ''),
+                'status': 'pending'
+            })
+            sequence_number += 1
+            
+        return execution_plan
+    
+    def generate_execution_instructions(self, execution_plan):
+        """Generate step-by-step execution instructions for Claude Code with exact function calls"""
+        total_actions = execution_plan['total_actions']
+        instructions = [
+            "🎯 **UAT STRUCTURED EXECUTION DETECTED**",
+            f"Total Actions: {total_actions}",
+            "",
+            "🚀 **EXECUTE THESE EXACT FUNCTION CALLS IN SEQUENCE:**",
+            "📋 Copy and paste each function call exactly as shown",
+            ""
+        ]
+        append = instructions.append
+        
+        for action in execution_plan['sequence']:
+            tool = action['tool']
+            description = action['description']
+            params = action['params']
+            
+            # Step header and exact function call block
+            function_call = self.generate_function_call_syntax(tool, params)
+            append(f"**🔸 Step {action['step']}/{total_actions}: {description}**\n```\n{function_call}\n```")
+            
+            if action['type'] == 'mcp_execution':
+                # Add parameter breakdown for clarity
+                if params:
+                    append("*Parameters:*")
+                    for key, value in params.items():
+                        if isinstance(value, str):
+                            append(f"- {key}: \"{value}\"")
+                        else:
+                            append(f"- {key}: {value}")
+            else:
+                append(f"*Validation*: {description}")
+            
+            append("")
+        
+        instructions.extend([
+            "🔄 **CRITICAL EXECUTION RULES:**",
+            "1. Execute ONLY the next step shown",
+            "2. Copy the exact function call from the code block",
+            "3. Wait for completion before proceeding to next step",
+            "4. Do not skip steps or change the order",
+            "5. Verify each step succeeds before continuing",
+            "",
+            "📊 **PROGRESS TRACKING**: Execute all steps to achieve 100% scenario coverage"
+        ])
+        
+        return "\n".join(instructions)
+    
+    def generate_function_call_syntax(self, tool, params):
+        """Generate exact MCP function call syntax that Claude can copy and execute"""
+        try:
+            # Handle different MCP tool patterns
+            if not tool or not params:
+                return f"# Invalid tool call: {tool}"
+            
+            # Build parameter string
+            param_string = ', '.join(
+                f'{key}={_FMT.get(type(value), repr)(value)}' for key, value in params.items()
+            )
+            
+            # Generate the actual function call
+            return f"{tool}({param_string})"
+            
+        except Exception as e:
+            return f"# Error generating function call for {tool}: {str(e)}"
+    
+    def save_execution_plan(self, execution_plan, session_id):
+        """Save execution plan to session directory for tracking"""
+        try:
+            session_dir = os.path.join(self.manager.session_dir, session_id)
+            if session_dir not in self._created_dirs:
+                os.makedirs(session_dir, exist_ok=True)
+                self._created_dirs.add(session_dir)
+            
+            # Serialize once and swap the file in, so trackers never read a partial plan
+            plan_file = os.path.join(session_dir, 'execution-plan.json')
+            write_atomic(plan_file, json.dumps(execution_plan, indent=2))
+                
+            return True
+        except Exception as e:
+            self._log(f"Failed to save execution plan: {str(e)}")
+            return False
+    
+    def process_bash_output(self, input_data):
+        """Process bash tool output to extract and structure MCP requests"""
+        try:
+            # Check if this is a bash tool with output containing MCP requests
+            tool_name = input_data.get('tool_name', '')
+            if tool_name != 'Bash':
+                return None
+                
+            # Get bash output/result 
+            tool_result = input_data.get('tool_result', '')
+            if not tool_result:
+                return None
+                
+            # Cheap gate: most bash output carries no request blocks at all
+            if _MCP_START not in tool_result and _VALIDATION_START not in tool_result:
+                return None
+            
+            # Extract MCP and validation requests from output in one pass
+            mcp_requests, validation_requests = self.extract_requests_from_output(tool_result)
+            
+            if not mcp_requests and not validation_requests:
+                return None
+            
+            # Load current session
+            session = self.manager.load_session()
+            if not session:
+                self._log("No active UAT session found for MCP bridge processing")
+                return None
+            
+            # Create structured execution plan, stamped once for this invocation
+            timestamp = datetime.now().isoformat()
+            execution_plan = self.create_structured_execution_plan(mcp_requests, validation_requests, timestamp)
+            
+            # Save execution plan
+            if self.save_execution_plan(execution_plan, session['sessionId']):
+                self._log(f"UAT MCP Bridge: Created execution plan with {execution_plan['total_actions']} actions")
+            
+            # Generate execution instructions
+            instructions = self.generate_execution_instructions(execution_plan)
+            
+            return {
+                'type': 'uat_structured_execution',
+                'execution_plan': execution_plan,
+                'instructions': instructions,
+                'session_id': session['sessionId']
+            }
+            
+        except Exception as e:
+            self._log(f"UAT MCP Bridge Error: {str(e)}")
+            return None
+
+def main():
+    """Main entry point for hook execution"""
+    try:
+        # Read input from stdin
+        input_data = json.loads(sys.stdin.buffer.read())
+        
+        # Create bridge instance
+        bridge = UATMCPBridge()
+        
+        # Process the input
+        result = bridge.process_bash_output(input_data)
+        
+        if result:
+            # Output structured execution instructions in a single write
+            sys.stdout.write("\n".join([
+                "\n" + "="*60,
+                "UAT MCP BRIDGE - STRUCTURED EXECUTION REQUIRED",
+                "="*60,
+                result['instructions'],
+                "="*60 + "\n"
+            ]) + "\n")
+            
+            sys.stderr.write(f"UAT MCP Bridge: Generated structured execution plan\n")
+        
+        # Exit successfully
+        sys.exit(0)
+        
+    except Exception as e:
+        sys.stderr.write(f"UAT MCP Bridge Fatal Error: {str(e)}\n")
+        sys.exit(1)
+
+if __name__ == "__main__":
+    main()
\ No newline at end of file
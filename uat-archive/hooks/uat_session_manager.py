@@ -0,0 +1,334 @@
+#!/usr/bin/env python3
+"""
+UAT Session Manager - Core session management for UAT testing
+Handles session initialization, state tracking, and scenario mapping
+"""
+
+import json
+import sys
+import os
+from datetime import datetime
+from itertools import islice
+import re
+
+# Scenario keyword mapping to scenario files (first match wins)
+_SCENARIO_MAP = {
+    'login': 'login-flow',
+    'login-flow': 'login-flow',
+    'auth': 'login-flow',
+    'authentication': 'login-flow',
+    'vehicle': 'vehicle-crud',
+    'vehicle-crud': 'vehicle-crud',
+    'crud': 'vehicle-crud',
+    'create': 'vehicle-crud',
+    'update': 'vehicle-crud',
+    'delete': 'vehicle-crud',
+    'error': 'error-handling',
+    'error-handling': 'error-handling',
+    'handling': 'error-handling',
+    'validation': 'error-handling'
+}
+
+# One pass over the message reporting, at every position, the highest-priority
+# keyword starting there (zero-width lookahead so overlapping keywords are kept)
+_SCENARIO_RE = re.compile('(?=(' + '|'.join(map(re.escape, _SCENARIO_MAP)) + '))')
+
+# Case-insensitive 'uat' gate, checked before lowercasing the whole message
+_UAT_RE = re.compile('uat', re.IGNORECASE)
+
+# Steps kept inline in current.json; older ones are appended to the session's steps.jsonl
+_STEP_WINDOW = 50
+
+def detect_uat_intent(message):
+    """
+    Detect UAT intent requiring 'uat' keyword + scenario keyword
+    Returns (is_uat, scenario_name)
+    """
+    # Must contain 'uat' keyword
+    if not _UAT_RE.search(message):
+        return False, None
+        
+    message_lower = message.lower()
+    
+    # Find matching scenario, keeping the map's priority order
+    found = {match.group(1) for match in _SCENARIO_RE.finditer(message_lower)}
+    if found:
+        for keyword, scenario in _SCENARIO_MAP.items():
+            if keyword in found:
+                return True, scenario
+                
+    # No scenario match found
+    return False, None
+
+def write_atomic(path, text):
+    """Write text to a per-process temp file beside path and atomically swap it in"""
+    # Hooks for parallel tool calls run as separate processes, so the temp name is per pid
+    tmp_path = f"{path}.{os.getpid()}.tmp"
+    try:
+        with open(tmp_path, 'w') as f:
+            f.write(text)
+        os.replace(tmp_path, path)
+    except BaseException:
+        # Don't leave a half-written temp file behind
+        try:
+            os.remove(tmp_path)
+        except OSError:
+            pass
+        raise
+
+class UATSessionManager:
+    def __init__(self, autoflush=True):
+        self.uat_root = '/mnt/c/projects/vrp-system/v4/uat'
+        self.session_dir = os.path.join(self.uat_root, 'sessions')
+        self.current_session_file = os.path.join(self.session_dir, 'current.json')
+        
+        # Session loaded or written by this process, reused instead of re-reading
+        self._session_cache = None
+        
+        # With autoflush off, saves only mark the session dirty until flush()
+        self.autoflush = autoflush
+        self._dirty = False
+        
+        # Timestamp pinned by a hook for the duration of one invocation
+        self._now = None
+        
+        # Ensure session directory exists
+        os.makedirs(self.session_dir, exist_ok=True)
+        
+    def pin_timestamp(self):
+        """Fix the timestamp used for records until the end of this hook invocation"""
+        self._now = datetime.now().isoformat()
+        return self._now
+        
+    def timestamp(self):
+        """ISO timestamp for records, the pinned one if pin_timestamp() was called"""
+        return self._now or datetime.now().isoformat()
+        
+    def detect_uat_intent(self, message):
+        """
+        Detect UAT intent requiring 'uat' keyword + scenario keyword
+        Returns (is_uat, scenario_name)
+        """
+        return detect_uat_intent(message)
+        
+    def init_session(self, scenario_name, user_message=None):
+        """Initialize a new UAT session"""
+        now = datetime.now()
+        session_id = now.strftime('%Y%m%d-%H%M%S')
+
+        session = {
+            'sessionId': session_id,
+            'scenario': scenario_name,
+            'startTime': now.isoformat(),
+            'status': 'active',
+            'phase': 'initialization',
+            'userMessage': user_message,
+            'steps': [],
+            'artifacts': {
+                'screenshots': [],
+                'logs': [],
+                'reports': []
+            },
+            'metrics': {
+                'totalSteps': 0,
+                'completedSteps': 0,
+                'failedSteps': 0,
+                'duration': 0
+            },
+            'execution_progress': {
+                'current_step': 1,
+                'completed_steps': [],
+                'total_steps': 0,
+                'last_executed_tool': '',
+                'status': 'ready',
+                'execution_plan_loaded': False
+            }
+        }
+        
+        # Save session
+        self.save_session(session)
+            
+        # Create session-specific directory
+        session_path = os.path.join(self.session_dir, session_id)
+        os.makedirs(session_path, exist_ok=True)
+        
+        return session
+        
+    def _write_json(self, path, data, indent=None):
+        """Write JSON to a sibling temp file and atomically swap it into place"""
+        # Compact by default; only the archived session is pretty-printed
+        if indent is None:
+            write_atomic(path, json.dumps(data, separators=(',', ':')))
+        else:
+            write_atomic(path, json.dumps(data, indent=indent))
+        
+    def load_session(self):
+        """Load current active session"""
+        if self._session_cache is not None:
+            return self._session_cache
+            
+        try:
+            with open(self.current_session_file, 'r') as f:
+                self._session_cache = json.load(f)
+        except (OSError, ValueError):
+            # Missing or unreadable session file means no active session
+            return None
+            
+        return self._session_cache
+            
+    def save_session(self, session):
+        """Persist an already-loaded session as the current session"""
+        self._session_cache = session
+        if self.autoflush:
+            self._write_current(session)
+        else:
+            self._dirty = True
+        return session
+        
+    def flush(self):
+        """Write the current session if saves were deferred since the last write"""
+        if self._dirty and self._session_cache is not None:
+            self._write_current(self._session_cache)
+        self._dirty = False
+        
+    def _steps_log_path(self, session):
+        """Append-only log of steps evicted from current.json"""
+        return os.path.join(self.session_dir, session['sessionId'], 'steps.jsonl')
+        
+    def _spilled_count(self, session):
+        """Number of the session's steps that precede its in-memory window"""
+        return max(0, session['metrics']['totalSteps'] - len(session['steps']))
+        
+    def _write_current(self, session):
+        """Spill steps beyond the recent window to steps.jsonl, then write current.json"""
+        steps = session.get('steps')
+        if steps and len(steps) > _STEP_WINDOW:
+            evict = len(steps) - _STEP_WINDOW
+            offset = self._spilled_count(session)
+            with open(self._steps_log_path(session), 'a+') as f:
+                # Append only evicted steps the log doesn't already hold, so another
+                # process writing the same loaded session can't duplicate them
+                f.seek(0)
+                start = max(0, sum(1 for _ in f) - offset)
+                if start < evict:
+                    f.write(''.join(json.dumps(step) + '\n' for step in steps[start:evict]))
+            del steps[:evict]
+        self._write_json(self.current_session_file, session)
+        
+    def update_session(self, updates):
+        """Update current session with new data"""
+        session = self.load_session()
+        if not session:
+            return None
+            
+        # Merge updates
+        for key, value in updates.items():
+            if isinstance(value, dict) and key in session:
+                session[key].update(value)
+            else:
+                session[key] = value
+                
+        # Save updated session
+        self.save_session(session)
+            
+        return session
+        
+    def add_step(self, step_data):
+        """Add a step to the current session"""
+        session = self.load_session()
+        if not session:
+            return None
+            
+        step = {
+            'timestamp': self.timestamp(),
+            'phase': session.get('phase', 'unknown'),
+            **step_data
+        }
+        
+        session['steps'].append(step)
+        session['metrics']['totalSteps'] += 1
+        
+        if step.get('status') == 'completed':
+            session['metrics']['completedSteps'] += 1
+        elif step.get('status') == 'failed':
+            session['metrics']['failedSteps'] += 1
+            
+        # Save updated session
+        self.save_session(session)
+            
+        return session
+        
+    def finalize_session(self, status='completed'):
+        """Finalize the current session"""
+        session = self.load_session()
+        if not session:
+            return None
+            
+        # Calculate duration against the same instant recorded as endTime
+        end_time = datetime.now()
+        start_time = datetime.fromisoformat(session['startTime'])
+        duration = (end_time - start_time).total_seconds()
+        
+        session['status'] = status
+        session['endTime'] = end_time.isoformat()
+        session['metrics']['duration'] = duration
+        
+        # Archive the full step history: spilled steps first, then the recent window.
+        # The cached session keeps its window so a retried finalize merges the same way
+        steps_log = self._steps_log_path(session)
+        try:
+            with open(steps_log, 'r') as f:
+                spilled = [json.loads(line) for line in islice(f, self._spilled_count(session))]
+        except FileNotFoundError:
+            spilled = []
+        final_session = {**session, 'steps': spilled + session['steps']}
+        
+        # Save final session
+        session_id = session['sessionId']
+        final_path = os.path.join(self.session_dir, session_id, 'session.json')
+        
+        self._write_json(final_path, final_session, indent=2)
+        
+        # The archive now holds every step; drop the spill log
+        try:
+            os.remove(steps_log)
+        except FileNotFoundError:
+            pass
+            
+        # Remove current session marker
+        if os.path.exists(self.current_session_file):
+            os.remove(self.current_session_file)
+        self._session_cache = None
+        self._dirty = False
+            
+        return final_session
+        
+    def get_scenario_path(self, scenario_name):
+        """Get full path to scenario file"""
+        return os.path.join(self.uat_root, 'scenarios', f'{scenario_name}.cjs')
+        
+    def scenario_exists(self, scenario_name):
+        """Check if scenario file exists"""
+        return os.path.exists(self.get_scenario_path(scenario_name))
+
+# CLI testing interface
+if __name__ == "__main__":
+    manager = UATSessionManager()
+    
+    # Test detection
+    test_phrases = [
+        "Run UAT for login flow",
+        "Execute UAT vehicle CRUD tests",
+        "Test UAT error handling",
+        "Test login flow",  # Should fail - no UAT
+        "Run UAT tests",    # Should fail - no scenario
+        "Perform UAT authentication testing"
+    ]
+    
+    print("UAT Intent Detection Tests:")
+    print("-" * 50)
+    
+    for phrase in test_phrases:
+        is_uat, scenario = manager.detect_uat_intent(phrase)
+        status = "✓" if is_uat else "✗"
+        print(f"{status} '{phrase}' -> UAT: {is_uat}, Scenario: {scenario}")
\ No newline at end of file